@@ -4,13 +4,84 @@ Handles starting/stopping Appium server and checking status
 """
 
 import subprocess
+import os
+import signal
 import time
 import threading
+import weakref
 import logging
-import requests
-import psutil
+import re
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+LOGS_DIR = Path(__file__).parent.parent / 'logs'
+# A server log past 5 MB is rotated when the next server launches. The server
+# writes straight to the file, so a running server's log is not capped
+ROTATE_ON_LAUNCH_LOG_BYTES = 5 * 1024 * 1024
+
+# First x.y.z on a line that is not a WARN or [bracketed] log line
+VERSION_PATTERN = re.compile(r'^(?![ \t]*(?:WARN|\[)).*?(\d+\.\d+\.\d+)', re.M)
+
+def _parse_appium_version(output):
+    """Extract the Appium version from `appium --version` output, or None"""
+    version_match = VERSION_PATTERN.search(output)
+    if version_match:
+        return version_match.group(1)
+    # Fallback to last non-warning line
+    for line in reversed(output.splitlines()):
+        line = line.strip()
+        if line and not line.startswith('WARN') and not line.startswith('['):
+            return line
+    return None
+
+# Prerequisite probe results only change when software is installed,
+# so cache them instead of spawning node/appium/adb on every refresh
+PROBE_CACHE_TTL = 60  # seconds
+_probe_cache = {}
+
+def _probe(cmd, timeout):
+    """Run a version probe command, returning cached (returncode, output) when fresh"""
+    now = time.monotonic()
+    cached = _probe_cache.get(cmd)
+    if cached and now - cached[0] < PROBE_CACHE_TTL:
+        return cached[1]
+    
+    try:
+        result = subprocess.run(list(cmd), capture_output=True, text=True, timeout=timeout)
+        probe = (result.returncode, result.stdout.strip())
+    except subprocess.TimeoutExpired:
+        probe = (None, "timed out")
+    except FileNotFoundError:
+        probe = (None, "not found")
+    except Exception as e:
+        probe = (None, f"failed with exception: {e}")
+    
+    _probe_cache[cmd] = (now, probe)
+    return probe
+
+def clear_probe_cache():
+    """Forget cached prerequisite probes (e.g. after installing software)"""
+    _probe_cache.clear()
+
+def _close_sessions(sessions):
+    """Close and forget a manager's /status sessions"""
+    for session in list(sessions):
+        session.close()
+    sessions.clear()
+
+# A small shared pool runs server start jobs for every manager, so servers
+# on different ports start side by side without a new thread per call
+MAX_SERVER_WORKERS = 4
+_server_executor = ThreadPoolExecutor(max_workers=MAX_SERVER_WORKERS, thread_name_prefix='appium-start')
+
 class AppiumServerManager:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -19,69 +90,74 @@ class AppiumServerManager:
         self.server_host = "127.0.0.1"
         self.server_url = f"http://{self.server_host}:{self.server_port}"
         self.is_running = False
+        # Keep-alive sessions for /status polls, one per polling thread since
+        # requests.Session is not thread-safe; stop_server retires them all
+        self._session_local = threading.local()
+        self._sessions = weakref.WeakSet()
+        self._session_generation = 0
+        self._session_lock = threading.Lock()
+        weakref.finalize(self, _close_sessions, self._sessions)
+        # Appium launcher resolved on PATH, reused by later start_server calls
+        self._appium_cmd = None
+        # Only Windows has the .cmd/.exe launcher variations
+        if os.name == 'nt':
+            self._probe_cmds = ('appium', 'appium.cmd', 'appium.exe')
+        else:
+            self._probe_cmds = ('appium',)
+        # Appium server options (v3.0.1 compatible), built once per manager
+        self._base_server_args = [
+            '--port', str(self.server_port),
+            '--address', self.server_host,  # Changed from --host to --address
+            '--session-override',  # Override existing sessions
+            '--log-timestamp',     # Add timestamps to logs
+            '--local-timezone',    # Use local timezone
+        ]
+        # Body of the last successful /status response
+        self._last_status = None
+        self.server_log_path = LOGS_DIR / f"appium-{self.server_port}.log"
+        # Server log offset where the latest launch started writing
+        self._log_start = 0
+        # Process group of the server we launched, so the whole tree stops together
+        self._pgid = None
+        # psutil.Process objects from the last find_appium_process scan, by pid
+        self._proc_cache = {}
         
     def check_node_installed(self):
         """Check if Node.js is installed"""
-        try:
-            result = subprocess.run(['node', '--version'], 
-                                  capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                self.logger.info(f"Node.js found: {version}")
-                return True, version
-            else:
-                return False, "Node.js not found"
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        returncode, version = _probe(('node', '--version'), timeout=5)
+        if returncode == 0:
+            self.logger.info(f"Node.js found: {version}")
+            return True, version
+        elif returncode is not None:
+            return False, "Node.js not found"
+        else:
             return False, "Node.js not installed"
     
     def check_appium_installed(self):
         """Check if Appium is installed globally"""
-        # Try multiple command variations for Windows compatibility
-        commands_to_try = ['appium', 'appium.cmd', 'appium.exe']
+        # Try multiple command variations for Windows compatibility,
+        # skipping any that are not on PATH instead of spawning them
+        commands_to_try = self._resolve_appium_commands()
         
-        for cmd in commands_to_try:
-            try:
-                result = subprocess.run([cmd, '--version'], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    version_output = result.stdout.strip()
-                    # Clean up version output (remove warnings and get actual version)
-                    version_lines = [line.strip() for line in version_output.split('\n') if line.strip()]
-                    
-                    # Look for version number in the output
-                    actual_version = None
-                    for line in version_lines:
-                        if line and not line.startswith('WARN') and not line.startswith('['):
-                            # Try to extract version number
-                            import re
-                            version_match = re.search(r'(\d+\.\d+\.\d+)', line)
-                            if version_match:
-                                actual_version = version_match.group(1)
-                                break
-                    
-                    if not actual_version:
-                        # Fallback to last non-warning line
-                        for line in reversed(version_lines):
-                            if not line.startswith('WARN') and not line.startswith('['):
-                                actual_version = line
-                                break
-                    
-                    if not actual_version:
-                        actual_version = "3.0.1"  # Default assumption if we can't parse
+        # Probe all variants concurrently and take the first one that answers
+        executor = ThreadPoolExecutor(max_workers=max(len(commands_to_try), 1))
+        futures = {executor.submit(_probe, (cmd, '--version'), 10): cmd for cmd in commands_to_try}
+        try:
+            for future in as_completed(futures):
+                cmd = futures[future]
+                returncode, version_output = future.result()
+                if returncode == 0:
+                    actual_version = _parse_appium_version(version_output) or "3.0.1"  # Default assumption if we can't parse
                     
                     self.logger.info(f"Appium found with command '{cmd}': {actual_version}")
+                    self._appium_cmd = cmd
                     return True, actual_version
+                elif returncode is not None:
+                    self.logger.debug(f"Command '{cmd}' failed with return code {returncode}")
                 else:
-                    self.logger.debug(f"Command '{cmd}' failed with return code {result.returncode}")
-            except subprocess.TimeoutExpired:
-                self.logger.debug(f"Command '{cmd}' timed out")
-                continue
-            except FileNotFoundError:
-                self.logger.debug(f"Command '{cmd}' not found")
-                continue
-            except Exception as e:
-                self.logger.debug(f"Command '{cmd}' failed with exception: {e}")
-                continue
+                    self.logger.debug(f"Command '{cmd}' {version_output}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
         
         # If direct commands fail, try checking if server is already running
         if self.check_server_running():
@@ -90,6 +166,12 @@ class AppiumServerManager:
         
         return False, "Appium not installed"
     
+    def _resolve_appium_commands(self):
+        """Return the Appium command variations that exist on PATH"""
+        if self._appium_cmd:
+            return [self._appium_cmd]
+        return [cmd for cmd in self._probe_cmds if shutil.which(cmd)]
+    
     def install_appium(self):
         """Install Appium globally via npm"""
         try:
@@ -99,6 +181,7 @@ class AppiumServerManager:
             
             if result.returncode == 0:
                 self.logger.info("Appium installed successfully")
+                clear_probe_cache()
                 return True, "Appium installed successfully"
             else:
                 error_msg = result.stderr or result.stdout
@@ -110,11 +193,46 @@ class AppiumServerManager:
         except Exception as e:
             return False, f"Installation error: {str(e)}"
     
+    def _get_session(self):
+        """Return this thread's keep-alive /status session, creating it on first use"""
+        local = self._session_local
+        if getattr(local, 'generation', None) != self._session_generation:
+            # requests is heavy to import, so only pay for it once we poll
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            with self._session_lock:
+                self._sessions.add(session)
+                local.session = session
+                local.generation = self._session_generation
+        return local.session
+    
+    def _retire_sessions(self):
+        """Close every /status session; each thread opens a fresh one on its next poll"""
+        with self._session_lock:
+            self._session_generation += 1
+            _close_sessions(self._sessions)
+    
+    def _fetch_status(self):
+        """GET /status, returning (ok, parsed body or None)"""
+        response = self._get_session().get(f"{self.server_url}/status", timeout=3)
+        if response.status_code != 200:
+            return False, None
+        try:
+            return True, _json_loads(response.content)
+        except ValueError:
+            return True, None
+    
     def check_server_running(self):
         """Check if Appium server is already running"""
+        import requests
+        
         try:
-            response = requests.get(f"{self.server_url}/status", timeout=3)
-            if response.status_code == 200:
+            ok, data = self._fetch_status()
+            if ok:
+                self._last_status = data
                 self.is_running = True
                 return True
             else:
@@ -125,27 +243,37 @@ class AppiumServerManager:
             return False
     
     def find_appium_process(self):
-        """Find running Appium processes"""
+        """Find running Appium processes (full process-table scan, use sparingly)"""
+        import psutil
+        
         appium_processes = []
+        proc_cache = {}
         try:
-            for process in psutil.process_iter(['pid', 'name', 'cmdline']):
+            # process_iter reuses its own Process instances between calls and
+            # fetches pid/name inside oneshot(), so no per-call rebuilding here
+            for process in psutil.process_iter(attrs=['pid', 'name']):
+                name = process.info['name']
+                # Cheap prefilter so cmdline is only read for node processes
+                if not name or name[0] not in 'nN' or 'node' not in name.lower():
+                    continue
                 try:
-                    if process.info['name'] and 'node' in process.info['name'].lower():
-                        cmdline = process.info['cmdline']
-                        if cmdline and any('appium' in cmd.lower() for cmd in cmdline):
-                            appium_processes.append({
-                                'pid': process.info['pid'],
-                                'cmdline': ' '.join(cmdline)
-                            })
+                    cmdline = ' '.join(process.cmdline())
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     continue
+                if 'appium' in cmdline.lower():
+                    proc_cache[process.info['pid']] = process
+                    appium_processes.append({
+                        'pid': process.info['pid'],
+                        'cmdline': cmdline
+                    })
         except Exception as e:
             self.logger.error(f"Error finding Appium processes: {e}")
         
+        self._proc_cache = proc_cache
         return appium_processes
     
     def start_server(self, callback=None):
-        """Start Appium server in background"""
+        """Start Appium server in background, returning the Future of the start job"""
         def _start_server():
             try:
                 # Check if server is already running
@@ -155,57 +283,46 @@ class AppiumServerManager:
                         callback(True, "Server already running")
                     return
                 
-                # Kill any existing Appium processes
-                existing_processes = self.find_appium_process()
-                for process in existing_processes:
-                    try:
-                        psutil.Process(process['pid']).terminate()
-                        self.logger.info(f"Terminated existing Appium process: {process['pid']}")
-                    except:
-                        pass
-                
-                # Wait a bit for processes to close
-                time.sleep(2)
-                
-                # Start new Appium server
+                # Start new Appium server (orphaned processes are only
+                # cleaned up by stop_server, /status is the liveness check)
                 self.logger.info(f"Starting Appium server on port {self.server_port}")
                 
                 # Try different command variations for Windows
-                appium_commands = ['appium', 'appium.cmd', 'appium.exe']
+                appium_commands = self._resolve_appium_commands()
                 
                 server_started = False
                 for appium_cmd in appium_commands:
                     try:
                         # Appium command with options (v3.0.1 compatible)
-                        cmd = [
-                            appium_cmd,
-                            '--port', str(self.server_port),
-                            '--address', self.server_host,  # Changed from --host to --address
-                            '--session-override',  # Override existing sessions
-                            '--log-timestamp',     # Add timestamps to logs
-                            '--local-timezone',    # Use local timezone
-                        ]
+                        cmd = [appium_cmd, *self._base_server_args]
                         
                         self.logger.info(f"Trying to start server with command: {appium_cmd}")
                         
-                        # Start process - remove CREATE_NEW_CONSOLE for better compatibility
-                        self.server_process = subprocess.Popen(
-                            cmd,
-                            stdout=subprocess.PIPE,
-                            stderr=subprocess.PIPE,
-                            text=True,
-                            shell=False  # Don't use shell on Windows
-                        )
+                        # Start process - remove CREATE_NEW_CONSOLE for better compatibility.
+                        # Output goes straight to the log file; a PIPE nobody drains
+                        # would eventually fill up and stall the server
+                        with self._open_server_log() as log_file:
+                            # Failure reports only show what this launch wrote
+                            self._log_start = log_file.seek(0, os.SEEK_END)
+                            self.server_process = subprocess.Popen(
+                                cmd,
+                                stdout=log_file,
+                                stderr=subprocess.STDOUT,
+                                shell=False,  # Don't use shell on Windows
+                                **self._process_group_kwargs()
+                            )
+                        if os.name != 'nt':
+                            self._pgid = os.getpgid(self.server_process.pid)
                         
                         # Wait a moment to see if process starts successfully
                         time.sleep(2)
                         if self.server_process.poll() is None:  # Process is still running
                             server_started = True
+                            self._appium_cmd = appium_cmd
                             self.logger.info(f"Successfully started Appium with command: {appium_cmd}")
                             break
                         else:
-                            stdout, stderr = self.server_process.communicate()
-                            self.logger.warning(f"Command {appium_cmd} failed immediately: {stderr}")
+                            self.logger.warning(f"Command {appium_cmd} failed immediately: {self._read_log_tail(start=self._log_start)}")
                             continue
                             
                     except FileNotFoundError:
@@ -222,10 +339,10 @@ class AppiumServerManager:
                         callback(False, error_msg)
                     return
                 
-                # Wait for server to start
-                max_attempts = 30  # 30 seconds timeout
-                for attempt in range(max_attempts):
-                    time.sleep(1)
+                # Wait for server to start, backing off from 50ms up to 1s between polls
+                deadline = time.monotonic() + 30  # 30 seconds timeout
+                delay = 0.05
+                while time.monotonic() < deadline:
                     if self.check_server_running():
                         self.logger.info("Appium server started successfully")
                         if callback:
@@ -233,13 +350,15 @@ class AppiumServerManager:
                         return
                     
                     # Check if process died
-                    if self.server_process.poll() is not None:
-                        stdout, stderr = self.server_process.communicate()
-                        error_msg = f"Server failed to start. Error: {stderr}"
+                    if not self._server_alive():
+                        error_msg = f"Server failed to start. Error: {self._read_log_tail(start=self._log_start)}"
                         self.logger.error(error_msg)
                         if callback:
                             callback(False, error_msg)
                         return
+                    
+                    time.sleep(delay)
+                    delay = min(delay * 1.6, 1.0)
                 
                 # Timeout
                 error_msg = "Server startup timeout"
@@ -253,29 +372,63 @@ class AppiumServerManager:
                 if callback:
                     callback(False, error_msg)
         
-        # Start in background thread
-        thread = threading.Thread(target=_start_server, daemon=True)
-        thread.start()
+        # Start on the shared pool; starts past MAX_SERVER_WORKERS wait for a free thread
+        return _server_executor.submit(_start_server)
+    
+    def _server_alive(self):
+        """Cheap liveness check for the launched server that does not reap it"""
+        if hasattr(os, 'waitid'):
+            try:
+                return os.waitid(os.P_PID, self.server_process.pid,
+                                 os.WEXITED | os.WNOHANG | os.WNOWAIT) is None
+            except ChildProcessError:
+                return False
+        # poll() is already a zero-timeout WaitForSingleObject on Windows
+        return self.server_process.poll() is None
+    
+    def _process_group_kwargs(self):
+        """Popen kwargs that put the server in its own process group"""
+        if os.name == 'nt':
+            return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+        return {'start_new_session': True}
+    
+    def _signal_server_group(self, kill=False):
+        """Signal the whole process group of the server we started"""
+        if os.name == 'nt':
+            if kill:
+                self.server_process.kill()
+            else:
+                self.server_process.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(self._pgid, signal.SIGKILL if kill else signal.SIGTERM)
     
-    def stop_server(self):
-        """Stop Appium server"""
+    def stop_server(self, force=False):
+        """Stop Appium server (force=True also kills Appium processes we did not start)"""
         try:
-            # Stop our process if we started it
+            # Stop our process group if we started it
             if self.server_process and self.server_process.poll() is None:
-                self.server_process.terminate()
-                self.server_process.wait(timeout=10)
+                self._signal_server_group()
+                try:
+                    self.server_process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    self._signal_server_group(kill=True)
+                    self.server_process.wait(timeout=5)
                 self.logger.info("Appium server stopped")
+            self._pgid = None
             
             # Kill any remaining Appium processes
-            existing_processes = self.find_appium_process()
-            for process in existing_processes:
-                try:
-                    psutil.Process(process['pid']).terminate()
-                    self.logger.info(f"Terminated Appium process: {process['pid']}")
-                except:
-                    pass
+            if force:
+                existing_processes = self.find_appium_process()
+                for process in existing_processes:
+                    try:
+                        # Cached objects also guard against the pid being reused
+                        self._proc_cache[process['pid']].terminate()
+                        self.logger.info(f"Terminated Appium process: {process['pid']}")
+                    except:
+                        pass
             
             self.is_running = False
+            self._retire_sessions()
             return True, "Server stopped successfully"
             
         except Exception as e:
@@ -283,8 +436,8 @@ class AppiumServerManager:
             self.logger.error(error_msg)
             return False, error_msg
     
-    def get_server_status(self):
-        """Get detailed server status"""
+    def get_server_status(self, deep=False):
+        """Get detailed server status (deep=True also scans for Appium processes)"""
         status = {
             'running': False,
             'url': self.server_url,
@@ -296,61 +449,88 @@ class AppiumServerManager:
         # Check if server is responding
         status['running'] = self.check_server_running()
         
-        # Get running processes
-        status['processes'] = self.find_appium_process()
+        # Process scan is expensive, only do it when explicitly asked
+        if deep:
+            status['processes'] = self.find_appium_process()
         
-        # Get version if available
-        if status['running']:
-            try:
-                response = requests.get(f"{self.server_url}/status", timeout=3)
-                if response.status_code == 200:
-                    data = response.json()
-                    status['version'] = data.get('value', {}).get('build', {}).get('version')
-            except:
-                pass
+        # Get version from the /status body we already fetched
+        if status['running'] and isinstance(self._last_status, dict):
+            status['version'] = self._last_status.get('value', {}).get('build', {}).get('version')
         
         return status
     
-    def get_server_logs(self):
-        """Get server logs if process is running"""
+    def _open_server_log(self):
+        """Open the server log for appending, rotating it on launch if it has grown too large"""
+        self.server_log_path.parent.mkdir(exist_ok=True)
+        if self.server_log_path.exists() and self.server_log_path.stat().st_size > ROTATE_ON_LAUNCH_LOG_BYTES:
+            self.server_log_path.replace(self.server_log_path.with_suffix('.log.1'))
+        return open(self.server_log_path, 'ab', buffering=0)
+    
+    def _read_log_tail(self, max_bytes=4096, start=0):
+        """Return the last max_bytes of the server log, skipping anything before offset start"""
+        try:
+            with open(self.server_log_path, 'rb') as log_file:
+                log_file.seek(0, 2)
+                log_file.seek(max(start, log_file.tell() - max_bytes))
+                return log_file.read().decode('utf-8', errors='replace')
+        except FileNotFoundError:
+            return ""
+    
+    def get_server_logs(self, max_bytes=65536):
+        """Get the tail of the server log if we started the server"""
         if not self.server_process:
             return "No server process found"
         
         try:
-            # This is basic - in production you'd want better log handling
-            return "Server logs would appear here (implement log file reading)"
+            return self._read_log_tail(max_bytes)
         except Exception as e:
             return f"Error reading logs: {str(e)}"
 
 # Utility functions for GUI integration
-def check_prerequisites():
-    """Check if all prerequisites are installed"""
+_prerequisites_cache = None
+
+def check_prerequisites(refresh=False):
+    """Check if all prerequisites are installed (refresh=True re-runs every probe)"""
+    global _prerequisites_cache
+    if refresh:
+        clear_probe_cache()
+    elif _prerequisites_cache and time.monotonic() - _prerequisites_cache[0] < PROBE_CACHE_TTL:
+        return _prerequisites_cache[1]
+    
     manager = AppiumServerManager()
     results = {}
     
-    # Check Node.js
-    node_ok, node_info = manager.check_node_installed()
-    results['node'] = {'installed': node_ok, 'info': node_info}
-    
-    # Check Appium
-    appium_ok, appium_info = manager.check_appium_installed()
-    results['appium'] = {'installed': appium_ok, 'info': appium_info}
+    # The probes are independent, so run them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        node_future = executor.submit(manager.check_node_installed)
+        appium_future = executor.submit(manager.check_appium_installed)
+        adb_future = executor.submit(_probe, ('adb', 'version'), 5)
+        
+        # Check Node.js
+        node_ok, node_info = node_future.result()
+        results['node'] = {'installed': node_ok, 'info': node_info}
+        
+        # Check Appium
+        appium_ok, appium_info = appium_future.result()
+        results['appium'] = {'installed': appium_ok, 'info': appium_info}
+        
+        # Check ADB (Android SDK)
+        returncode, adb_output = adb_future.result()
     
-    # Check ADB (Android SDK)
-    try:
-        result = subprocess.run(['adb', 'version'], capture_output=True, text=True, timeout=5)
-        adb_ok = result.returncode == 0
-        adb_info = result.stdout.strip() if adb_ok else "ADB not found"
-    except:
+    if returncode is None:
         adb_ok, adb_info = False, "ADB not installed"
+    else:
+        adb_ok = returncode == 0
+        adb_info = adb_output if adb_ok else "ADB not found"
     
     results['adb'] = {'installed': adb_ok, 'info': adb_info}
     
+    _prerequisites_cache = (time.monotonic(), results)
     return results
 
 def install_missing_prerequisites():
     """Install missing prerequisites"""
-    results = check_prerequisites()
+    results = check_prerequisites(refresh=True)
     installation_results = {}
     
     # Install Appium if missing
@@ -358,6 +538,9 @@ def install_missing_prerequisites():
         manager = AppiumServerManager()
         success, message = manager.install_appium()
         installation_results['appium'] = {'success': success, 'message': message}
+        
+        # Re-probe once here so the next check_prerequisites() call is served from cache
+        check_prerequisites(refresh=True)
     
     return installation_results
 
@@ -374,7 +557,7 @@ if __name__ == "__main__":
         print(f"{status} {component}: {info['info']}")
     
     print("\n🚀 Checking server status...")
-    status = manager.get_server_status()
+    status = manager.get_server_status(deep=True)
     print(f"Server running: {status['running']}")
     print(f"Server URL: {status['url']}")
     print(f"Active processes: {len(status['processes'])}")
@@ -8,15 +8,184 @@ import logging
 import time
 from datetime import datetime
 from pathlib import Path
-import hashlib
 import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from dataclasses import dataclass, asdict
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Safety levels
+SAFE = 'SAFE'
+FORBIDDEN = 'FORBIDDEN'
+HIGH_RISK = 'HIGH_RISK'
+MEDIUM_RISK = 'MEDIUM_RISK'
+ERROR = 'ERROR'
+
+# Starting point for every element validation result
+_SAFE_RESULT = MappingProxyType({
+    'is_safe': True,
+    'safety_level': SAFE,
+    'violations': (),
+    'warnings': (),
+    'recommendations': (),
+    'requires_manual_review': False
+})
+
+# Element recommendations
+FORBIDDEN_RECOMMENDATIONS = (
+    "🚫 DO NOT AUTOMATE: Element violates banking safety rules",
+    "📝 Document why automation is needed for this element",
+    "👥 Requires approval from compliance team"
+)
+HIGH_RISK_RECOMMENDATIONS = (
+    "⚠️ HIGH RISK: Use extreme caution",
+    "🔍 Manual review required before automation",
+    "📊 Monitor closely during test execution",
+    "🔒 Use test accounts only - never production data"
+)
+REVIEW_RECOMMENDATIONS = (
+    "👀 Manual review recommended",
+    "📋 Verify with business team before automating"
+)
+REC_NO_RESOURCE_ID = "⚠️ No stable resource-id found - automation may be brittle"
+REC_SAFE_NAVIGATION = "✅ Safe for navigation automation"
+
+VALIDATION_CACHE_SIZE = 4096
+# Smallest batch worth handing to a process pool
+PARALLEL_VALIDATION_MIN_ELEMENTS = 256
+AUDIT_LOG_SIZE = 1000
+
+def _read_json(path):
+    """Load a JSON file, using orjson when it is installed"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _write_json(path, data, pretty=False):
+    """Write data to a JSON file (compact unless pretty), using orjson when it is installed"""
+    if orjson:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        with open(path, 'w', buffering=1 << 16) as f:
+            if pretty:
+                json.dump(data, f, indent=4)
+            else:
+                json.dump(data, f, separators=(',', ':'))
+
+@dataclass
+class SafetyAuditEntry:
+    """Audit trail entry for an element safety validation"""
+    __slots__ = ('timestamp', 'element_id', 'element_text', 'safety_level',
+                 'is_safe', 'violations', 'warnings')
+    timestamp: str
+    element_id: str
+    element_text: str
+    safety_level: str
+    is_safe: bool
+    violations: list
+    warnings: list
+
+@dataclass
+class ActionAuditEntry:
+    """Audit trail entry for a test action validation"""
+    __slots__ = ('timestamp', 'action_type', 'element_id', 'element_text',
+                 'allowed', 'risk_level', 'warnings')
+    timestamp: str
+    action_type: str
+    element_id: str
+    element_text: str
+    allowed: bool
+    risk_level: str
+    warnings: list
+
+_last_timestamp = (0, '')
+
+def _now_iso():
+    """Current local time as an ISO string, formatted at most once per second"""
+    global _last_timestamp
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp = (now, datetime.fromtimestamp(now).isoformat())
+    return _last_timestamp[1]
+
+class _KeywordMatcher:
+    """
+    Finds which keywords occur in a text with a single regex pass
+    
+    Equivalent to [kw for kw in keywords if kw in text]. Alternatives are
+    tried longest first, so a keyword shadowed by a longer one starting at
+    the same position is recovered as a substring of that longer keyword.
+    """
+    
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        unique = sorted(set(self.keywords), key=len, reverse=True)
+        self._implied = {kw: {other for other in unique if other in kw} for kw in unique}
+        self._pattern = re.compile('(?=(%s))' % '|'.join(map(re.escape, unique))) if unique else None
+    
+    def find(self, text):
+        """Return the keywords found in text, in their original order"""
+        if self._pattern is None:
+            return []
+        found = set()
+        for hit in set(self._pattern.findall(text)):
+            found |= self._implied[hit]
+        return [kw for kw in self.keywords if kw in found]
+
+# Banking risk keywords (lowercase), matched as substrings of the element text.
+# Substring rather than whole-token matching is deliberate: resource ids like
+# "enterpassword" or "fingerprintauth" must still be caught.
+FINANCIAL_KEYWORDS = (
+    'amount', 'balance', 'transfer', 'payment', 'deposit',
+    'withdraw', 'currency', 'dollar', 'euro', 'account'
+)
+AUTH_KEYWORDS = ('password', 'pin', 'biometric', 'fingerprint', 'face', 'token')
+CONFIRM_KEYWORDS = ('confirm', 'execute', 'submit', 'authorize', 'approve')
+
+TAP_TRANSACTION_KEYWORDS = ('confirm', 'execute', 'submit', 'transfer', 'pay')
+
+_FINANCIAL_MATCHER = _KeywordMatcher(FINANCIAL_KEYWORDS)
+_AUTH_MATCHER = _KeywordMatcher(AUTH_KEYWORDS)
+_CONFIRM_MATCHER = _KeywordMatcher(CONFIRM_KEYWORDS)
+# Only needs a yes/no answer, so a plain alternation is enough
+_TAP_TRANSACTION_MATCHER = re.compile('|'.join(TAP_TRANSACTION_KEYWORDS))
+
+def _safety_audit_entry(element_info, validation_result):
+    """Build the audit trail entry for an element validation"""
+    return SafetyAuditEntry(
+        timestamp=_now_iso(),
+        element_id=element_info.get('resource_id', 'unknown'),
+        element_text=element_info.get('text', ''),
+        safety_level=validation_result['safety_level'],
+        is_safe=validation_result['is_safe'],
+        violations=validation_result['violations'],
+        warnings=validation_result['warnings']
+    )
 
 class BankingSafetyManager:
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, safety_rules=None):
         self.logger = logging.getLogger(__name__)
         self.config_path = config_path or Path("banking_safety_config.json")
-        self.safety_rules = self.load_safety_rules()
-        self.audit_log = []
+        # Rules passed in directly (e.g. by pool workers) skip the config file
+        self.safety_rules = safety_rules if safety_rules is not None else self.load_safety_rules()
+        # Run every check even after an element is already forbidden
+        # (only needed for exhaustive violation lists)
+        self._full_scan = False
+        # Guards the validation cache, which callers on several threads may share
+        self._cache_lock = threading.Lock()
+        self._compile_safety_rules()
+        # Bounded, so old entries fall off without periodic list copies
+        self.audit_log = deque(maxlen=AUDIT_LOG_SIZE)
+        # Reading a deque while another thread appends raises, so guard both
+        self._audit_lock = threading.Lock()
         
     def load_safety_rules(self):
         """Load banking safety rules from configuration"""
@@ -60,8 +229,7 @@ class BankingSafetyManager:
         
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    loaded_rules = json.load(f)
+                loaded_rules = _read_json(self.config_path)
                 # Merge with defaults
                 default_rules.update(loaded_rules)
                 self.logger.info("Safety rules loaded from configuration")
@@ -74,11 +242,40 @@ class BankingSafetyManager:
         
         return default_rules
     
+    def _compile_safety_rules(self):
+        """Build matchers for the current safety rules (call whenever rules change)"""
+        forbidden = self.safety_rules['forbidden_elements']
+        self._forbidden_id_matcher = _KeywordMatcher(forbidden['resource_ids'])
+        # Class names match case-insensitively, so lowercase them once here
+        self._forbidden_classes = [(name, name.lower()) for name in forbidden['class_names']]
+        self._forbidden_class_matcher = _KeywordMatcher(lowered for _, lowered in self._forbidden_classes)
+        with self._cache_lock:
+            self._validation_cache = {}
+        self._restricted_actions = frozenset(self.safety_rules['restricted_actions'])
+        self._safe_navigation = frozenset(self.safety_rules['safe_navigation'])
+        self._compiled_text_patterns = [
+            (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in forbidden['text_patterns']
+        ]
+        # One alternation of every pattern screens out clean text in a single
+        # search; the individual patterns only run when it hits. Patterns with
+        # capture groups are never combined: joining them renumbers the groups,
+        # so a backreference would silently point at another pattern's group
+        self._combined_text_pattern = None
+        if forbidden['text_patterns'] and not any(
+            compiled.groups for _, compiled in self._compiled_text_patterns
+        ):
+            try:
+                self._combined_text_pattern = re.compile(
+                    '|'.join(f"(?:{pattern})" for pattern in forbidden['text_patterns']), re.IGNORECASE
+                )
+            except re.error:
+                # e.g. conflicting inline flags; fall back to the individual patterns
+                pass
+    
     def save_safety_rules(self, rules):
         """Save safety rules to configuration file"""
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(rules, f, indent=4)
+            _write_json(self.config_path, rules)
         except Exception as e:
             self.logger.error(f"Failed to save safety rules: {e}")
     
@@ -86,109 +283,184 @@ class BankingSafetyManager:
         """
         Comprehensive safety validation for banking elements
         
+        Safe to call concurrently on a shared manager.
+        
         Args:
             element_info: Dictionary containing element information
             
         Returns:
             dict: Safety validation result
         """
-        validation_result = {
-            'is_safe': True,
-            'safety_level': 'SAFE',
-            'violations': [],
-            'warnings': [],
-            'recommendations': [],
-            'requires_manual_review': False
-        }
+        validation_result = self._validate_element_cached(element_info)
+        
+        # Log validation
+        if validation_result['safety_level'] != ERROR:
+            self._log_safety_validation(element_info, validation_result)
+        
+        return validation_result
+    
+    def _validate_element_cached(self, element_info):
+        """Validate an element through the validation cache (no audit logging)"""
+        try:
+            # Everything the validation reads, so identical elements share one result
+            cache_key = (
+                element_info.get('resource_id', ''),
+                element_info.get('text', ''),
+                element_info.get('content_desc', ''),
+                element_info.get('class_name', ''),
+                element_info.get('password'),
+                element_info.get('clickable'),
+                bool(element_info.get('locators', {}).get('resource_id')),
+                self._full_scan
+            )
+            hash(cache_key)
+        except (TypeError, AttributeError):
+            cache_key = None
+        
+        cached = None
+        if cache_key is not None:
+            with self._cache_lock:
+                cached = self._validation_cache.get(cache_key)
+        if cached is None:
+            cached = self._validate_element_uncached(element_info)
+            if cache_key is not None:
+                with self._cache_lock:
+                    if len(self._validation_cache) >= VALIDATION_CACHE_SIZE:
+                        # Evict the oldest entry
+                        del self._validation_cache[next(iter(self._validation_cache))]
+                    self._validation_cache[cache_key] = cached
+        
+        # Hand out copies so callers mutating the lists can't poison the cache
+        validation_result = dict(cached)
+        for field in ('violations', 'warnings', 'recommendations'):
+            validation_result[field] = list(cached[field])
+        
+        return validation_result
+    
+    def _validate_element_uncached(self, element_info):
+        """Run every safety check on an element (no caching, no audit logging)"""
+        validation_result = dict(_SAFE_RESULT, violations=[], warnings=[], recommendations=[])
         
         try:
             # Check forbidden resource IDs
             resource_id = element_info.get('resource_id', '').lower()
-            for forbidden_id in self.safety_rules['forbidden_elements']['resource_ids']:
-                if forbidden_id in resource_id:
-                    validation_result['is_safe'] = False
-                    validation_result['safety_level'] = 'FORBIDDEN'
-                    validation_result['violations'].append(f"Forbidden resource ID pattern: {forbidden_id}")
+            for forbidden_id in self._forbidden_id_matcher.find(resource_id):
+                validation_result['is_safe'] = False
+                validation_result['safety_level'] = FORBIDDEN
+                validation_result['violations'].append(f"Forbidden resource ID pattern: {forbidden_id}")
             
-            # Check forbidden text patterns
-            element_text = ' '.join([
-                element_info.get('text', ''),
-                element_info.get('content_desc', ''),
-                resource_id
-            ]).lower()
+            # Once an element is forbidden the verdict can't change, so the
+            # remaining checks only run when a full violation list is wanted
+            full_scan = self._full_scan
             
-            for pattern in self.safety_rules['forbidden_elements']['text_patterns']:
-                if re.search(pattern, element_text):
-                    validation_result['is_safe'] = False
-                    validation_result['safety_level'] = 'FORBIDDEN'
-                    validation_result['violations'].append(f"Forbidden text pattern: {pattern}")
+            # Check forbidden text patterns
+            if full_scan or validation_result['is_safe']:
+                # Lowercased once here and shared with the banking risk check
+                element_text = f"{element_info.get('text', '')} {element_info.get('content_desc', '')} {resource_id}".lower()
+                
+                combined = self._combined_text_pattern
+                if combined is None or combined.search(element_text):
+                    for pattern, compiled_pattern in self._compiled_text_patterns:
+                        if compiled_pattern.search(element_text):
+                            validation_result['is_safe'] = False
+                            validation_result['safety_level'] = FORBIDDEN
+                            validation_result['violations'].append(f"Forbidden text pattern: {pattern}")
             
             # Check forbidden class names
-            class_name = element_info.get('class_name', '')
-            for forbidden_class in self.safety_rules['forbidden_elements']['class_names']:
-                if forbidden_class.lower() in class_name.lower():
-                    validation_result['is_safe'] = False
-                    validation_result['safety_level'] = 'FORBIDDEN'
-                    validation_result['violations'].append(f"Forbidden class name: {forbidden_class}")
+            if full_scan or validation_result['is_safe']:
+                class_name = element_info.get('class_name', '')
+                matched_classes = set(self._forbidden_class_matcher.find(class_name.lower()))
+                for forbidden_class, lowered in self._forbidden_classes:
+                    if lowered in matched_classes:
+                        validation_result['is_safe'] = False
+                        validation_result['safety_level'] = FORBIDDEN
+                        validation_result['violations'].append(f"Forbidden class name: {forbidden_class}")
             
             # Check for banking-specific risks
-            banking_risks = self._assess_banking_risks(element_info)
-            if banking_risks['risk_level'] == 'HIGH':
-                validation_result['safety_level'] = 'HIGH_RISK'
-                validation_result['warnings'].extend(banking_risks['warnings'])
-                validation_result['requires_manual_review'] = True
+            if full_scan or validation_result['is_safe']:
+                banking_risks = self._assess_banking_risks(element_info, element_text)
+                if banking_risks['risk_level'] == 'HIGH':
+                    validation_result['safety_level'] = HIGH_RISK
+                    validation_result['warnings'].extend(banking_risks['warnings'])
+                    validation_result['requires_manual_review'] = True
             
             # Generate recommendations
             validation_result['recommendations'] = self._generate_safety_recommendations(element_info, validation_result)
             
-            # Log validation
-            self._log_safety_validation(element_info, validation_result)
-            
         except Exception as e:
             self.logger.error(f"Safety validation failed: {e}")
             validation_result['is_safe'] = False
-            validation_result['safety_level'] = 'ERROR'
+            validation_result['safety_level'] = ERROR
             validation_result['violations'].append(f"Validation error: {str(e)}")
         
         return validation_result
     
-    def _assess_banking_risks(self, element_info):
-        """Assess banking-specific risks"""
+    def validate_elements(self, elements, workers=None):
+        """
+        Safety validation for a batch of elements
+        
+        Repeated elements (menus, list rows) are only checked once thanks
+        to the validation cache; every element still gets its own result
+        and audit entry.
+        
+        Args:
+            elements: List of element information dictionaries
+            workers: Number of worker processes for large batches (opt-in;
+                frozen executables need multiprocessing.freeze_support())
+            
+        Returns:
+            list: Safety validation result for each element, in order
+        """
+        if workers and workers > 1 and len(elements) >= PARALLEL_VALIDATION_MIN_ELEMENTS:
+            try:
+                return self._validate_elements_parallel(elements, workers)
+            except Exception as e:
+                self.logger.warning(f"Parallel validation failed, validating serially: {e}")
+        
+        return [self.validate_element_safety(element) for element in elements]
+    
+    def _validate_elements_parallel(self, elements, workers):
+        """Validate elements across a process pool, then merge the audit entries"""
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_validation_worker,
+                                 initargs=(self.safety_rules, self._full_scan)) as executor:
+            results = list(executor.map(_validate_in_worker, elements, chunksize=64))
+        
+        validations = []
+        with self._audit_lock:
+            for validation, log_entry in results:
+                validations.append(validation)
+                if log_entry is not None:
+                    self.audit_log.append(log_entry)
+        return validations
+    
+    def _assess_banking_risks(self, element_info, element_text_lower=None):
+        """Assess banking-specific risks (element_text_lower: pre-lowered text/desc/id, if already built)"""
         risks = {
             'risk_level': 'LOW',
             'warnings': [],
             'factors': []
         }
         
-        # Financial transaction indicators
-        financial_keywords = [
-            'amount', 'balance', 'transfer', 'payment', 'deposit', 
-            'withdraw', 'currency', 'dollar', 'euro', 'account'
-        ]
-        
-        element_text = ' '.join([
-            element_info.get('resource_id', ''),
-            element_info.get('text', ''),
-            element_info.get('content_desc', '')
-        ]).lower()
+        element_text = element_text_lower
+        if element_text is None:
+            element_text = f"{element_info.get('resource_id', '')} {element_info.get('text', '')} {element_info.get('content_desc', '')}".lower()
         
-        financial_matches = [kw for kw in financial_keywords if kw in element_text]
+        # Financial transaction indicators
+        financial_matches = _FINANCIAL_MATCHER.find(element_text)
         if financial_matches:
             risks['risk_level'] = 'MEDIUM'
             risks['warnings'].append(f"Financial keywords detected: {', '.join(financial_matches)}")
             risks['factors'].append('financial_content')
         
         # Authentication elements
-        auth_keywords = ['password', 'pin', 'biometric', 'fingerprint', 'face', 'token']
-        auth_matches = [kw for kw in auth_keywords if kw in element_text]
+        auth_matches = _AUTH_MATCHER.find(element_text)
         if auth_matches:
             risks['risk_level'] = 'HIGH'
             risks['warnings'].append(f"Authentication elements: {', '.join(auth_matches)}")
             risks['factors'].append('authentication_required')
         
         # Transaction confirmation elements
-        confirm_keywords = ['confirm', 'execute', 'submit', 'authorize', 'approve']
-        confirm_matches = [kw for kw in confirm_keywords if kw in element_text]
+        confirm_matches = _CONFIRM_MATCHER.find(element_text)
         if confirm_matches and element_info.get('clickable'):
             risks['risk_level'] = 'HIGH'
             risks['warnings'].append(f"Transaction confirmation detected: {', '.join(confirm_matches)}")
@@ -207,49 +479,31 @@ class BankingSafetyManager:
         recommendations = []
         
         if not validation_result['is_safe']:
-            recommendations.append("🚫 DO NOT AUTOMATE: Element violates banking safety rules")
-            recommendations.append("📝 Document why automation is needed for this element")
-            recommendations.append("👥 Requires approval from compliance team")
+            recommendations.extend(FORBIDDEN_RECOMMENDATIONS)
         
-        elif validation_result['safety_level'] == 'HIGH_RISK':
-            recommendations.append("⚠️ HIGH RISK: Use extreme caution")
-            recommendations.append("🔍 Manual review required before automation")
-            recommendations.append("📊 Monitor closely during test execution")
-            recommendations.append("🔒 Use test accounts only - never production data")
+        elif validation_result['safety_level'] == HIGH_RISK:
+            recommendations.extend(HIGH_RISK_RECOMMENDATIONS)
         
         elif validation_result['requires_manual_review']:
-            recommendations.append("👀 Manual review recommended")
-            recommendations.append("📋 Verify with business team before automating")
+            recommendations.extend(REVIEW_RECOMMENDATIONS)
         
         # Locator recommendations
         locators = element_info.get('locators', {})
         if not locators.get('resource_id'):
-            recommendations.append("⚠️ No stable resource-id found - automation may be brittle")
+            recommendations.append(REC_NO_RESOURCE_ID)
         
         if element_info.get('clickable') and validation_result['is_safe']:
-            recommendations.append("✅ Safe for navigation automation")
+            recommendations.append(REC_SAFE_NAVIGATION)
         
         return recommendations
     
     def _log_safety_validation(self, element_info, validation_result):
         """Log safety validation for audit trail"""
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'element_id': element_info.get('resource_id', 'unknown'),
-            'element_text': element_info.get('text', ''),
-            'safety_level': validation_result['safety_level'],
-            'is_safe': validation_result['is_safe'],
-            'violations': validation_result['violations'],
-            'warnings': validation_result['warnings']
-        }
-        
-        self.audit_log.append(log_entry)
-        
-        # Keep audit log size manageable
-        if len(self.audit_log) > 1000:
-            self.audit_log = self.audit_log[-500:]  # Keep last 500 entries
+        log_entry = _safety_audit_entry(element_info, validation_result)
+        with self._audit_lock:
+            self.audit_log.append(log_entry)
     
-    def validate_test_action(self, action_type, element_info, additional_context=None):
+    def validate_test_action(self, action_type, element_info, additional_context=None, element_validation=None):
         """
         Validate if a test action is safe to perform
         
@@ -257,6 +511,8 @@ class BankingSafetyManager:
             action_type: Type of action (tap, type, swipe, etc.)
             element_info: Information about target element
             additional_context: Additional context for the action
+            element_validation: Result of validate_element_safety for element_info,
+                if the caller already has one (skips validating it again)
             
         Returns:
             dict: Action validation result
@@ -271,18 +527,19 @@ class BankingSafetyManager:
         
         try:
             # Check if action is in restricted list
-            if action_type in self.safety_rules['restricted_actions']:
+            if action_type in self._restricted_actions:
                 validation['allowed'] = False
-                validation['risk_level'] = 'FORBIDDEN'
+                validation['risk_level'] = FORBIDDEN
                 validation['warnings'].append(f"Action '{action_type}' is in restricted actions list")
                 return validation
             
             # Validate the target element
-            element_validation = self.validate_element_safety(element_info)
+            if element_validation is None:
+                element_validation = self.validate_element_safety(element_info)
             
             if not element_validation['is_safe']:
                 validation['allowed'] = False
-                validation['risk_level'] = 'FORBIDDEN'
+                validation['risk_level'] = FORBIDDEN
                 validation['warnings'].append("Target element violates safety rules")
                 validation['warnings'].extend(element_validation['violations'])
                 return validation
@@ -290,19 +547,19 @@ class BankingSafetyManager:
             # Special validation for different action types
             if action_type == 'type' and element_info.get('password'):
                 validation['allowed'] = False
-                validation['risk_level'] = 'FORBIDDEN'
+                validation['risk_level'] = FORBIDDEN
                 validation['warnings'].append("Typing in password fields is forbidden")
             
             elif action_type == 'tap':
                 # Check if tapping financial/transaction elements
                 element_text = element_info.get('text', '').lower()
-                if any(word in element_text for word in ['confirm', 'execute', 'submit', 'transfer', 'pay']):
+                if _TAP_TRANSACTION_MATCHER.search(element_text):
                     validation['allowed'] = False
                     validation['risk_level'] = 'HIGH'
                     validation['warnings'].append("Tapping transaction confirmation elements is high risk")
             
             # Add audit requirement for all actions on sensitive elements
-            if element_validation['safety_level'] in ['HIGH_RISK', 'MEDIUM_RISK']:
+            if element_validation['safety_level'] in [HIGH_RISK, MEDIUM_RISK]:
                 validation['audit_required'] = True
                 validation['required_confirmations'].append("Confirm this action is necessary for the test")
             
@@ -312,27 +569,28 @@ class BankingSafetyManager:
         except Exception as e:
             self.logger.error(f"Action validation failed: {e}")
             validation['allowed'] = False
-            validation['risk_level'] = 'ERROR'
+            validation['risk_level'] = ERROR
             validation['warnings'].append(f"Validation error: {str(e)}")
         
         return validation
     
     def _log_action_validation(self, action_type, element_info, validation):
         """Log action validation for audit"""
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'action_type': action_type,
-            'element_id': element_info.get('resource_id', 'unknown'),
-            'element_text': element_info.get('text', ''),
-            'allowed': validation['allowed'],
-            'risk_level': validation['risk_level'],
-            'warnings': validation['warnings']
-        }
+        log_entry = ActionAuditEntry(
+            timestamp=_now_iso(),
+            action_type=action_type,
+            element_id=element_info.get('resource_id', 'unknown'),
+            element_text=element_info.get('text', ''),
+            allowed=validation['allowed'],
+            risk_level=validation['risk_level'],
+            warnings=validation['warnings']
+        )
         
-        self.audit_log.append(log_entry)
+        with self._audit_lock:
+            self.audit_log.append(log_entry)
     
-    def generate_safety_report(self, scan_results):
-        """Generate comprehensive safety report for a screen scan"""
+    def generate_safety_report(self, scan_results, workers=None):
+        """Generate comprehensive safety report for a screen scan (workers: see validate_elements)"""
         report = {
             'scan_summary': {
                 'timestamp': datetime.now().isoformat(),
@@ -350,23 +608,23 @@ class BankingSafetyManager:
             },
             'compliance_status': 'COMPLIANT',
             'recommendations': [],
-            'audit_trail': self.audit_log[-50:],  # Last 50 entries
+            'audit_trail': self.get_audit_trail(50),  # Last 50 entries
             'detailed_findings': []
         }
         
         try:
             elements = scan_results.get('elements', [])
             
-            for element in elements:
-                # Validate each element
-                validation = self.validate_element_safety(element)
-                
+            # Validate all elements in one batch
+            validations = self.validate_elements(elements, workers)
+            
+            for element, validation in zip(elements, validations):
                 # Update counters
                 if not validation['is_safe']:
                     report['safety_analysis']['total_violations'] += 1
                     report['safety_analysis']['forbidden_elements'] += 1
                     report['compliance_status'] = 'NON_COMPLIANT'
-                elif validation['safety_level'] == 'HIGH_RISK':
+                elif validation['safety_level'] == HIGH_RISK:
                     report['safety_analysis']['high_risk_elements'] += 1
                 elif validation['requires_manual_review']:
                     report['safety_analysis']['requires_review'] += 1
@@ -418,19 +676,22 @@ class BankingSafetyManager:
         return report
     
     def get_audit_trail(self, limit=100):
-        """Get recent audit trail entries"""
-        return self.audit_log[-limit:] if self.audit_log else []
+        """Get recent audit trail entries (as dicts)"""
+        with self._audit_lock:
+            start = max(0, len(self.audit_log) - limit)
+            entries = list(islice(self.audit_log, start, None))
+        return [asdict(entry) for entry in entries]
     
     def clear_audit_trail(self):
         """Clear audit trail (use with caution)"""
-        self.audit_log.clear()
+        with self._audit_lock:
+            self.audit_log.clear()
         self.logger.info("Audit trail cleared")
     
     def export_safety_config(self, export_path):
         """Export current safety configuration"""
         try:
-            with open(export_path, 'w') as f:
-                json.dump(self.safety_rules, f, indent=4)
+            _write_json(export_path, self.safety_rules, pretty=True)
             self.logger.info(f"Safety configuration exported to {export_path}")
             return True
         except Exception as e:
@@ -440,13 +701,13 @@ class BankingSafetyManager:
     def import_safety_config(self, import_path):
         """Import safety configuration"""
         try:
-            with open(import_path, 'r') as f:
-                imported_rules = json.load(f)
+            imported_rules = _read_json(import_path)
             
             # Validate imported rules have required structure
             required_keys = ['forbidden_elements', 'restricted_actions', 'safe_navigation']
             if all(key in imported_rules for key in required_keys):
                 self.safety_rules = imported_rules
+                self._compile_safety_rules()
                 self.save_safety_rules(imported_rules)
                 self.logger.info(f"Safety configuration imported from {import_path}")
                 return True
@@ -457,11 +718,38 @@ class BankingSafetyManager:
             self.logger.error(f"Failed to import safety config: {e}")
             return False
 
+# Process pool workers for validate_elements
+_worker_manager = None
+
+def _init_validation_worker(safety_rules, full_scan):
+    """Build the worker's own manager from the parent's rules"""
+    global _worker_manager
+    _worker_manager = BankingSafetyManager(safety_rules=safety_rules)
+    _worker_manager._full_scan = full_scan
+    _worker_manager._validation_cache.clear()
+
+def _validate_in_worker(element_info):
+    """Validate one element, returning (validation, audit entry or None)"""
+    validation = _worker_manager._validate_element_cached(element_info)
+    if validation['safety_level'] == ERROR:
+        return validation, None
+    return validation, _safety_audit_entry(element_info, validation)
+
 # Utility functions for integration
+
+# One shared manager per config path, so repeated quick validations don't
+# reload the safety rules from disk each time. Validation is thread-safe:
+# the validation cache and the audit log each have their own lock
+_manager_cache = {}
+_manager_cache_lock = threading.Lock()
+
 def validate_banking_element(element_info, config_path=None):
     """
     Quick validation function for banking elements
     
+    Safe to call from several threads. Calls with the same config path share
+    one BankingSafetyManager, whose validation cache and audit log are locked.
+    
     Args:
         element_info: Element information dictionary
         config_path: Optional path to safety configuration
@@ -469,7 +757,11 @@ def validate_banking_element(element_info, config_path=None):
     Returns:
         dict: Validation result
     """
-    safety_manager = BankingSafetyManager(config_path)
+    key = str(config_path or '_default_')
+    with _manager_cache_lock:
+        safety_manager = _manager_cache.get(key)
+        if safety_manager is None:
+            safety_manager = _manager_cache[key] = BankingSafetyManager(config_path)
     return safety_manager.validate_element_safety(element_info)
 
 def create_default_safety_config(output_path):
@@ -4,30 +4,342 @@ Complete database management and export functionality for banking automation
 """
 
 import sqlite3
-import pandas as pd
 import json
 import csv
 import logging
+import os
 import time
-from datetime import datetime, timedelta
+import threading
+import queue
+import weakref
 from pathlib import Path
-import hashlib
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils.dataframe import dataframe_to_rows
+import secrets
+import tempfile
+from contextlib import contextmanager
+from copy import copy
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-connection tuning applied by DatabaseManager._connect()
+CONNECTION_PRAGMAS = (
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-262144',
+    'PRAGMA mmap_size=1073741824',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA foreign_keys=ON',
+    # INSERT OR REPLACE must fire delete triggers so the full-text index stays in sync
+    'PRAGMA recursive_triggers=ON',
+)
+
+# ui_elements columns returned by get_elements_by_scan
+ELEMENT_COLUMNS = (
+    'id', 'scan_id', 'app_name', 'screen_name', 'element_type', 'element_id',
+    'resource_id', 'xpath', 'accessibility_id', 'text_content', 'content_desc',
+    'bounds', 'clickable', 'enabled', 'displayed', 'password', 'class_name',
+    'locator_strategies', 'safety_level', 'safety_reason', 'automation_allowed',
+    'automation_notes', 'detection_method', 'screenshot_path', 'created_at',
+)
+
+# Statements reused on every call, so sqlite3's statement cache keeps them compiled
+INSERT_SESSION_SQL = '''
+    INSERT INTO scan_sessions 
+    (scan_id, app_name, screen_name, scan_duration, total_elements, 
+     device_info, scan_metadata, screenshot_path, safety_warnings)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_ELEMENT_SQL = '''
+    INSERT OR REPLACE INTO ui_elements 
+    (scan_id, app_name, screen_name, element_type, element_id, 
+     resource_id, xpath, accessibility_id, text_content, content_desc,
+     bounds, clickable, enabled, displayed, password, class_name,
+     locator_strategies, safety_level, safety_reason, automation_allowed,
+     automation_notes, detection_method, screenshot_path)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_EXPORT_SQL = '''
+    INSERT INTO export_history 
+    (export_type, file_path, record_count, filters_applied, file_size_bytes, exported_by)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+SELECT_ELEMENTS_BY_SCAN_SQL = f'''
+    SELECT {', '.join(ELEMENT_COLUMNS)} FROM ui_elements WHERE scan_id = ?
+    ORDER BY created_at ASC
+'''
+
+# Tables counted by get_database_stats
+STATS_TABLES = ('ui_elements', 'test_cases', 'test_steps', 'test_executions', 'scan_sessions')
+
+DATABASE_STATS_SQL = 'SELECT ' + ', '.join(
+    [f'(SELECT COUNT(*) FROM {table})' for table in STATS_TABLES] + [
+        '(SELECT MIN(created_at) FROM ui_elements)',
+        '(SELECT MAX(created_at) FROM ui_elements)',
+    ]
+)
+
+# Background scan writer: scans queued before save_scan_results blocks,
+# and most scans committed per transaction
+ASYNC_QUEUE_SIZE = 256
+ASYNC_MAX_BATCH = 64
+
+# Size of each connection's prepared statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# Most read-only connections a manager keeps open; readers beyond this wait
+# for a connection to be handed back
+READER_POOL_SIZE = 4
+
+# Columns written by each element export
+CSV_EXPORT_SQL = '''
+    SELECT 
+        scan_id,
+        app_name,
+        screen_name,
+        element_type,
+        resource_id,
+        text_content,
+        content_desc,
+        bounds,
+        clickable,
+        enabled,
+        safety_level,
+        safety_reason,
+        automation_allowed,
+        created_at
+    FROM ui_elements
+'''
+
+EXCEL_EXPORT_SQL = '''
+    SELECT 
+        scan_id,
+        app_name,
+        screen_name,
+        element_type,
+        resource_id,
+        text_content,
+        content_desc,
+        bounds,
+        clickable,
+        enabled,
+        displayed,
+        safety_level,
+        safety_reason,
+        automation_allowed,
+        automation_notes,
+        created_at
+    FROM ui_elements
+'''
+
+EXPORT_ORDER_SQL = ' ORDER BY created_at DESC'
+
+# Export filter key -> (SQL condition, whether falsy values like False still filter)
+FILTER_CONDITIONS = {
+    'app_name': ('app_name = ?', False),
+    'safety_level': ('safety_level = ?', False),
+    'automation_allowed': ('automation_allowed = ?', True),
+    'date_from': ('created_at >= ?', False),
+    # FTS5 phrase search over text_content and content_desc (value quoted by _build_filter_clause)
+    'text': ('id IN (SELECT rowid FROM ui_elements_fts WHERE ui_elements_fts MATCH ?)', False),
+}
+
+# Filters honoured by each export
+CSV_EXPORT_FILTERS = ('app_name', 'safety_level', 'automation_allowed', 'date_from', 'text')
+EXCEL_EXPORT_FILTERS = ('app_name', 'safety_level', 'text')
+
+# Excel row colors per safety level
+SAFETY_COLORS = {
+    'HIGH_RISK': 'FFCCCC',  # Light red
+    'MEDIUM_RISK': 'FFFFCC',  # Light yellow
+    'LOW_RISK': 'CCFFCC',  # Light green
+    'SAFE': 'CCE5FF'  # Light blue
+}
+
+# Most rows per multi-row INSERT in save_elements_df. The real chunk is cut
+# down to fit SQLite's bound-parameter limit, which is 999 before 3.32
+DF_INSERT_CHUNK_SIZE = 500
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+# Rows fetched per batch when streaming exports
+EXPORT_BATCH_SIZE = 10000
+
+# Batches fetched ahead of the export writer
+EXPORT_PREFETCH_BATCHES = 4
+
+def _json_dumps(obj):
+    """Serialize to a JSON string, using orjson when it is available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj)
+
+@lru_cache(maxsize=1)
+def _safety_fills():
+    """Solid fills per safety level, built on the first Excel export"""
+    from openpyxl.styles import PatternFill
+    return {
+        level: PatternFill(start_color=color, end_color=color, fill_type="solid")
+        for level, color in SAFETY_COLORS.items()
+    }
+
+@lru_cache(maxsize=64)
+def _where_clause(filter_keys):
+    """Build the WHERE clause for a set of filter keys, shared across calls"""
+    if not filter_keys:
+        return ''
+    return ' WHERE ' + ' AND '.join(FILTER_CONDITIONS[key][0] for key in filter_keys)
+
+def _build_filter_clause(filters, allowed_keys):
+    """
+    Turn export filters into a WHERE clause and its parameters
+    
+    Args:
+        filters: Dictionary of filters to apply, or None
+        allowed_keys: Filter keys the caller honours, in clause order
+        
+    Returns:
+        tuple: (where_clause, params)
+    """
+    if not filters:
+        return '', []
+    
+    keys = []
+    params = []
+    for key in allowed_keys:
+        value = filters.get(key)
+        if value is None or (not value and not FILTER_CONDITIONS[key][1]):
+            continue
+        if key == 'text':
+            # Match the text as one literal phrase rather than FTS5 query syntax
+            value = '"' + str(value).replace('"', '""') + '"'
+        keys.append(key)
+        params.append(value)
+    
+    return _where_clause(tuple(keys)), params
+
+def _prefetch_batches(cursor, batch_size):
+    """
+    Yield fetchmany batches while a background thread fetches the next ones
+    
+    SQLite releases the GIL while stepping the query, so fetching overlaps with
+    the caller encoding and writing the previous batch. The bounded queue caps
+    how many batches are held in memory at once.
+    """
+    batches = queue.Queue(maxsize=EXPORT_PREFETCH_BATCHES)
+    stop = threading.Event()
+    
+    def offer(item):
+        # Wait for room, but give up once the consumer has gone away
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def produce():
+        try:
+            rows = True
+            while rows and not stop.is_set():
+                rows = cursor.fetchmany(batch_size)
+                offer(rows)
+        except Exception as e:
+            offer(e)
+    
+    producer = threading.Thread(target=produce, name='export-prefetch', daemon=True)
+    producer.start()
+    try:
+        while True:
+            rows = batches.get()
+            if isinstance(rows, Exception):
+                raise rows
+            if not rows:
+                return
+            yield rows
+    finally:
+        # Let the producer exit even if the caller stopped early
+        stop.set()
+        producer.join()
+
+def _close_connections(write_conn, readers):
+    """Close the writer and every reader opened for a manager"""
+    for conn in (write_conn, *readers):
+        try:
+            conn.close()
+        except Exception:
+            pass
 
 class DatabaseManager:
     def __init__(self, db_path="mobile_tests.db"):
         self.db_path = Path(db_path)
+        self._db_path_str = str(self.db_path)
         self.logger = logging.getLogger(__name__)
+        
+        # One long-lived writer shared under a lock, plus a bounded pool of
+        # readers opened on demand and handed back after each call
+        self._write_conn = self._connect()
+        self._write_lock = threading.Lock()
+        self._idle_readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(READER_POOL_SIZE)
+        self._readers = []
+        self._finalizer = weakref.finalize(self, _close_connections, self._write_conn, self._readers)
+        
+        # Background scan writer, off until start_async()
+        self._pending = None
+        self._flush_thread = None
+        
         self.ensure_database_exists()
+    
+    def _connect(self):
+        """Open a connection with the tuning pragmas applied"""
+        # Autocommit mode: writes that need a transaction open one explicitly
+        conn = sqlite3.connect(
+            self._db_path_str, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE,
+            isolation_level=None
+        )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def _reader(self):
+        """Borrow a read-only connection from the pool, opening one if none is idle"""
+        with self._reader_slots:
+            try:
+                conn = self._idle_readers.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+                self._readers.append(conn)
+            try:
+                yield conn
+            finally:
+                self._idle_readers.put(conn)
+    
+    def close(self):
+        """Close the writer and all reader connections"""
+        self.stop_async()
+        self._finalizer()
         
     def ensure_database_exists(self):
         """Create database and tables if they don't exist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_lock, self._write_conn as conn:
                 cursor = conn.cursor()
                 
+                # Page size only takes effect on a new database and must precede WAL;
+                # WAL itself persists in the database file, so it only needs setting once
+                cursor.execute('PRAGMA page_size=8192')
+                cursor.execute('PRAGMA journal_mode=WAL')
+                cursor.execute('BEGIN')
+                
                 # UI Elements table
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS ui_elements (
@@ -148,13 +460,95 @@ class DatabaseManager:
                     )
                 ''')
                 
+                # Indexes for export filters, session listing and history.
+                # ui_elements(scan_id) is already covered by the UNIQUE constraint.
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_ui_elements_app_safety
+                    ON ui_elements (app_name, safety_level, created_at DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_ui_elements_created
+                    ON ui_elements (created_at)
+                ''')
+                # Per-app date-range exports: app_name = ? AND created_at >= ?, newest first
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_ui_elements_app_created
+                    ON ui_elements (app_name, created_at DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_scan_sessions_app_time
+                    ON scan_sessions (app_name, scan_timestamp DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_export_history_time
+                    ON export_history (export_timestamp DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_test_steps_case
+                    ON test_steps (test_case_id, step_order)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_ui_elements_safety
+                    ON ui_elements (safety_level, created_at DESC)
+                ''')
+                
+                # Full-text index over element text, kept in sync by triggers
+                self._create_element_text_index(cursor)
+                
                 conn.commit()
+                
+                # Refresh planner statistics; the limit keeps this cheap on large databases
+                cursor.execute('PRAGMA analysis_limit=1000')
+                cursor.execute('ANALYZE')
+                
                 self.logger.info("Database schema initialized successfully")
                 
         except Exception as e:
-            self.logger.error(f"Failed to initialize database: {e}")
+            self.logger.error("Failed to initialize database: %s", e)
             raise
     
+    def _create_element_text_index(self, cursor):
+        """Create the FTS5 index over element text and description, if SQLite supports it"""
+        exists = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ui_elements_fts'"
+        ).fetchone()
+        if exists:
+            return
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE ui_elements_fts USING fts5(
+                    text_content, content_desc, content='ui_elements', content_rowid='id'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            self.logger.warning("Full-text search unavailable, 'text' export filter disabled: %s", e)
+            return
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS ui_elements_fts_insert AFTER INSERT ON ui_elements BEGIN
+                INSERT INTO ui_elements_fts (rowid, text_content, content_desc)
+                VALUES (new.id, new.text_content, new.content_desc);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS ui_elements_fts_delete AFTER DELETE ON ui_elements BEGIN
+                INSERT INTO ui_elements_fts (ui_elements_fts, rowid, text_content, content_desc)
+                VALUES ('delete', old.id, old.text_content, old.content_desc);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS ui_elements_fts_update AFTER UPDATE ON ui_elements BEGIN
+                INSERT INTO ui_elements_fts (ui_elements_fts, rowid, text_content, content_desc)
+                VALUES ('delete', old.id, old.text_content, old.content_desc);
+                INSERT INTO ui_elements_fts (rowid, text_content, content_desc)
+                VALUES (new.id, new.text_content, new.content_desc);
+            END
+        ''')
+        
+        # Index rows saved before the index existed
+        cursor.execute("INSERT INTO ui_elements_fts (ui_elements_fts) VALUES ('rebuild')")
+    
     def save_scan_results(self, scan_results):
         """
         Save complete scan results to database
@@ -163,91 +557,253 @@ class DatabaseManager:
             scan_results: Dictionary containing scan results from element scanner
             
         Returns:
-            str: Scan ID for the saved session
+            str: Scan ID for the saved session (queued for the background
+            writer when start_async() is active)
         """
         try:
-            scan_id = f"scan_{int(time.time())}_{hashlib.md5(str(scan_results).encode()).hexdigest()[:8]}"
+            scan = self._prepare_scan(scan_results)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            # Hand the scan to the background writer when it is running
+            pending = self._pending
+            if pending is not None:
+                pending.put(scan)
+                return scan[0]
+            
+            return scan[0] if self._write_scans([scan]) else None
                 
-                # Save scan session
-                cursor.execute('''
-                    INSERT INTO scan_sessions 
-                    (scan_id, app_name, screen_name, scan_duration, total_elements, 
-                     device_info, scan_metadata, screenshot_path, safety_warnings)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+        except Exception as e:
+            self.logger.error("Failed to save scan results: %s", e)
+            return None
+    
+    def _prepare_scan(self, scan_results):
+        """Build the session row and element rows for a scan, outside any transaction"""
+        scan_id = f"scan_{int(time.time())}_{secrets.token_hex(4)}"
+        
+        # Scan-level fields shared by the session row and every element row
+        app_name = scan_results.get('app_name', 'Unknown')
+        screen_name = scan_results.get('screen_name', 'Unknown')
+        metadata = scan_results.get('metadata', {})
+        screenshot_path = metadata.get('screenshot_path', '')
+        elements = scan_results.get('elements', [])
+        
+        session_row = (
+            scan_id,
+            app_name,
+            screen_name,
+            scan_results.get('scan_duration', 0),
+            len(elements),
+            _json_dumps(metadata),
+            _json_dumps(scan_results.get('statistics', {})),
+            screenshot_path,
+            _json_dumps(scan_results.get('warnings', []))
+        )
+        
+        # Build element rows up front so the write transaction stays short
+        element_rows = []
+        for element in elements:
+            try:
+                get = element.get
+                safety_classification = get('safety_classification', {})
+                locators = get('locators', {})
+                resource_id = get('resource_id', '')
+                content_desc = get('content_desc', '')
+                
+                element_rows.append((
                     scan_id,
-                    scan_results.get('app_name', 'Unknown'),
-                    scan_results.get('screen_name', 'Unknown'),
-                    scan_results.get('scan_duration', 0),
-                    len(scan_results.get('elements', [])),
-                    json.dumps(scan_results.get('metadata', {})),
-                    json.dumps(scan_results.get('statistics', {})),
-                    scan_results.get('metadata', {}).get('screenshot_path', ''),
-                    json.dumps(scan_results.get('warnings', []))
+                    app_name,
+                    screen_name,
+                    get('class_name', 'Unknown'),
+                    resource_id,
+                    resource_id,
+                    locators.get('xpath_resource_id', ''),
+                    content_desc,
+                    get('text', ''),
+                    content_desc,
+                    get('bounds', ''),
+                    get('clickable', False),
+                    get('enabled', False),
+                    get('displayed', False),
+                    get('password', False),
+                    get('class_name', ''),
+                    _json_dumps(locators),
+                    safety_classification.get('level', 'UNKNOWN'),
+                    safety_classification.get('reason', ''),
+                    safety_classification.get('automation_allowed', True),
+                    _json_dumps(get('automation_notes', [])),
+                    get('detection_method', 'unknown'),
+                    screenshot_path
                 ))
                 
-                # Save individual elements
-                elements_saved = 0
-                for element in scan_results.get('elements', []):
+            except Exception as e:
+                self.logger.warning("Failed to save element: %s", e)
+                continue
+        
+        return scan_id, session_row, element_rows
+    
+    def _write_scans(self, scans):
+        """
+        Write prepared scans in one transaction
+        
+        Args:
+            scans: List of (scan_id, session_row, element_rows) from _prepare_scan
+            
+        Returns:
+            bool: True if every scan was saved
+        """
+        try:
+            saved = []
+            with self._write_lock, self._write_conn as conn:
+                cursor = conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
+                
+                for scan_id, session_row, element_rows in scans:
+                    # Save scan session
+                    cursor.execute(INSERT_SESSION_SQL, session_row)
+                    
+                    # Save individual elements in one batch, under a savepoint so
+                    # a failed batch can be undone before the per-element retry
+                    cursor.execute('SAVEPOINT elements')
                     try:
-                        safety_classification = element.get('safety_classification', {})
-                        locators = element.get('locators', {})
-                        automation_notes = element.get('automation_notes', [])
-                        
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO ui_elements 
-                            (scan_id, app_name, screen_name, element_type, element_id, 
-                             resource_id, xpath, accessibility_id, text_content, content_desc,
-                             bounds, clickable, enabled, displayed, password, class_name,
-                             locator_strategies, safety_level, safety_reason, automation_allowed,
-                             automation_notes, detection_method, screenshot_path)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            scan_id,
-                            scan_results.get('app_name', 'Unknown'),
-                            scan_results.get('screen_name', 'Unknown'),
-                            element.get('class_name', 'Unknown'),
-                            element.get('resource_id', ''),
-                            element.get('resource_id', ''),
-                            locators.get('xpath_resource_id', ''),
-                            element.get('content_desc', ''),
-                            element.get('text', ''),
-                            element.get('content_desc', ''),
-                            element.get('bounds', ''),
-                            element.get('clickable', False),
-                            element.get('enabled', False),
-                            element.get('displayed', False),
-                            element.get('password', False),
-                            element.get('class_name', ''),
-                            json.dumps(locators),
-                            safety_classification.get('level', 'UNKNOWN'),
-                            safety_classification.get('reason', ''),
-                            safety_classification.get('automation_allowed', True),
-                            json.dumps(automation_notes),
-                            element.get('detection_method', 'unknown'),
-                            scan_results.get('metadata', {}).get('screenshot_path', '')
-                        ))
-                        elements_saved += 1
-                        
-                    except Exception as e:
-                        self.logger.warning(f"Failed to save element: {e}")
-                        continue
+                        cursor.executemany(INSERT_ELEMENT_SQL, element_rows)
+                        elements_saved = len(element_rows)
+                    except sqlite3.Error as e:
+                        # A row the batch could not bind; drop the rows it already
+                        # wrote, then retry one by one and skip the bad ones
+                        self.logger.warning("Batch element insert failed, retrying per element: %s", e)
+                        cursor.execute('ROLLBACK TO elements')
+                        elements_saved = 0
+                        for row in element_rows:
+                            try:
+                                cursor.execute(INSERT_ELEMENT_SQL, row)
+                                elements_saved += 1
+                            except sqlite3.Error as e:
+                                self.logger.warning("Failed to save element: %s", e)
+                    cursor.execute('RELEASE elements')
+                    
+                    saved.append((scan_id, elements_saved))
                 
                 conn.commit()
-                self.logger.info(f"Saved scan session {scan_id} with {elements_saved} elements")
-                return scan_id
-                
+            
+            for scan_id, elements_saved in saved:
+                self.logger.info("Saved scan session %s with %s elements", scan_id, elements_saved)
+            return True
+            
         except Exception as e:
-            self.logger.error(f"Failed to save scan results: {e}")
-            return None
+            if len(scans) == 1:
+                self.logger.error("Failed to save scan results: %s", e)
+                return False
+            
+            # Keep one bad scan from taking the rest of the batch with it
+            self.logger.warning("Batched scan save failed, retrying one by one: %s", e)
+            results = [self._write_scans([scan]) for scan in scans]
+            return all(results)
+    
+    def start_async(self, max_batch=ASYNC_MAX_BATCH):
+        """
+        Queue scan saves for a background writer instead of writing inline
+        
+        save_scan_results then returns as soon as the scan is queued; the writer
+        commits up to max_batch queued scans per transaction. Call flush() to
+        wait for queued scans, and stop_async() or close() before exiting.
+        
+        Args:
+            max_batch: Most scans committed in one transaction
+        """
+        if self._pending is not None:
+            return
+        
+        pending = queue.Queue(maxsize=ASYNC_QUEUE_SIZE)
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, args=(pending, max_batch),
+            name='scan-writer', daemon=True
+        )
+        self._pending = pending
+        self._flush_thread.start()
+    
+    def _flush_loop(self, pending, max_batch):
+        """Background writer: commit queued scans in batches until told to stop"""
+        while True:
+            batch = [pending.get()]
+            while len(batch) < max_batch:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            
+            # None is the stop signal from stop_async()
+            scans = [scan for scan in batch if scan is not None]
+            if scans:
+                self._write_scans(scans)
+            for _ in batch:
+                pending.task_done()
+            
+            if len(scans) != len(batch):
+                return
+    
+    def flush(self):
+        """Wait until every queued scan has been written"""
+        pending = self._pending
+        if pending is not None:
+            pending.join()
+    
+    def stop_async(self):
+        """Write any queued scans and stop the background writer"""
+        pending = self._pending
+        if pending is None:
+            return
+        
+        # New saves go straight to the database from here on
+        self._pending = None
+        pending.put(None)
+        self._flush_thread.join()
+        self._flush_thread = None
+        
+        # Pick up anything queued while the writer was shutting down
+        leftovers = []
+        while True:
+            try:
+                scan = pending.get_nowait()
+            except queue.Empty:
+                break
+            if scan is not None:
+                leftovers.append(scan)
+        if leftovers:
+            self._write_scans(leftovers)
+    
+    def save_elements_df(self, df, scan_id):
+        """
+        Bulk-insert UI elements held in a DataFrame
+        
+        Args:
+            df: DataFrame whose columns are named after ui_elements columns
+            scan_id: Scan ID to store the elements under
+        
+        Returns:
+            int: Number of elements saved
+        """
+        try:
+            df = df.assign(scan_id=scan_id)
+            columns = [column for column in ELEMENT_COLUMNS if column != 'id' and column in df.columns]
+            chunk_size = max(1, min(DF_INSERT_CHUNK_SIZE, SQLITE_MAX_VARIABLES // len(columns)))
+            
+            with self._write_lock, self._write_conn as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                df[columns].to_sql(
+                    'ui_elements', conn, if_exists='append', index=False,
+                    method='multi', chunksize=chunk_size
+                )
+            
+            self.logger.info("Saved %s elements to scan %s", len(df), scan_id)
+            return len(df)
+        
+        except Exception as e:
+            self.logger.error("Failed to save elements DataFrame: %s", e)
+            return 0
     
     def get_scan_sessions(self, limit=50, app_name=None):
         """Get recent scan sessions"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 
                 query = '''
@@ -266,100 +822,57 @@ class DatabaseManager:
                 
                 cursor.execute(query, params)
                 return cursor.fetchall()
-                
+            
         except Exception as e:
-            self.logger.error(f"Failed to get scan sessions: {e}")
+            self.logger.error("Failed to get scan sessions: %s", e)
             return []
     
     def get_elements_by_scan(self, scan_id):
         """Get all elements from a specific scan"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM ui_elements WHERE scan_id = ?
-                    ORDER BY created_at ASC
-                ''', (scan_id,))
-                
-                columns = [description[0] for description in cursor.description]
-                rows = cursor.fetchall()
-                
-                return [dict(zip(columns, row)) for row in rows]
+                cursor.execute(SELECT_ELEMENTS_BY_SCAN_SQL, (scan_id,))
                 
+                return [dict(zip(ELEMENT_COLUMNS, row)) for row in cursor]
+            
         except Exception as e:
-            self.logger.error(f"Failed to get elements for scan {scan_id}: {e}")
+            self.logger.error("Failed to get elements for scan %s: %s", scan_id, e)
             return []
     
-    def export_to_csv(self, output_path, filters=None):
+    def export_to_csv(self, output_path, filters=None, chunk_size=EXPORT_BATCH_SIZE):
         """
         Export UI elements to CSV with optional filtering
         
         Args:
             output_path: Path to save CSV file
             filters: Dictionary of filters to apply
+            chunk_size: Rows fetched and written per batch
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 # Build query with filters
-                query = '''
-                    SELECT 
-                        scan_id,
-                        app_name,
-                        screen_name,
-                        element_type,
-                        resource_id,
-                        text_content,
-                        content_desc,
-                        bounds,
-                        clickable,
-                        enabled,
-                        safety_level,
-                        safety_reason,
-                        automation_allowed,
-                        created_at
-                    FROM ui_elements
-                '''
-                
-                conditions = []
-                params = []
-                
-                if filters:
-                    if filters.get('app_name'):
-                        conditions.append('app_name = ?')
-                        params.append(filters['app_name'])
-                    
-                    if filters.get('safety_level'):
-                        conditions.append('safety_level = ?')
-                        params.append(filters['safety_level'])
-                    
-                    if filters.get('automation_allowed') is not None:
-                        conditions.append('automation_allowed = ?')
-                        params.append(filters['automation_allowed'])
-                    
-                    if filters.get('date_from'):
-                        conditions.append('created_at >= ?')
-                        params.append(filters['date_from'])
+                where_clause, params = _build_filter_clause(filters, CSV_EXPORT_FILTERS)
+                query = CSV_EXPORT_SQL + where_clause + EXPORT_ORDER_SQL
                 
-                if conditions:
-                    query += ' WHERE ' + ' AND '.join(conditions)
+                if not self._has_matching_elements(conn, where_clause, params):
+                    self.logger.info("No records match the CSV export filters, nothing written")
+                    return 0
                 
-                query += ' ORDER BY created_at DESC'
-                
-                # Execute query and save to CSV
-                df = pd.read_sql_query(query, conn, params=params)
-                df.to_csv(output_path, index=False)
+                # Execute query and stream rows to CSV in batches
+                record_count = self._write_csv(conn.execute(query, params), output_path, chunk_size)
                 
                 # Record export history
-                self._record_export(output_path, 'CSV', len(df), filters)
-                
-                self.logger.info(f"Exported {len(df)} records to CSV: {output_path}")
-                return len(df)
+                self._record_export(output_path, 'CSV', record_count, filters)
                 
+                self.logger.info("Exported %s records to CSV: %s", record_count, output_path)
+                return record_count
+            
         except Exception as e:
-            self.logger.error(f"CSV export failed: {e}")
+            self.logger.error("CSV export failed: %s", e)
             return 0
     
-    def export_to_excel(self, output_path, filters=None, include_charts=True):
+    def export_to_excel(self, output_path, filters=None, include_charts=True, chunk_size=EXPORT_BATCH_SIZE):
         """
         Export UI elements to Excel with formatting and optional charts
         
@@ -367,123 +880,158 @@ class DatabaseManager:
             output_path: Path to save Excel file
             filters: Dictionary of filters to apply
             include_charts: Whether to include summary charts
+            chunk_size: Rows fetched and written per batch
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 # Get main data
-                query = '''
-                    SELECT 
-                        scan_id,
-                        app_name,
-                        screen_name,
-                        element_type,
-                        resource_id,
-                        text_content,
-                        content_desc,
-                        bounds,
-                        clickable,
-                        enabled,
-                        displayed,
-                        safety_level,
-                        safety_reason,
-                        automation_allowed,
-                        automation_notes,
-                        created_at
-                    FROM ui_elements
-                '''
+                where_clause, params = _build_filter_clause(filters, EXCEL_EXPORT_FILTERS)
+                query = EXCEL_EXPORT_SQL + where_clause + EXPORT_ORDER_SQL
                 
-                conditions = []
-                params = []
+                if not self._has_matching_elements(conn, where_clause, params):
+                    self.logger.info("No records match the Excel export filters, nothing written")
+                    return 0
                 
-                if filters:
-                    if filters.get('app_name'):
-                        conditions.append('app_name = ?')
-                        params.append(filters['app_name'])
-                    
-                    if filters.get('safety_level'):
-                        conditions.append('safety_level = ?')
-                        params.append(filters['safety_level'])
+                cursor = conn.cursor()
+                cursor.execute(query, params)
+                headers = [description[0] for description in cursor.description]
                 
-                if conditions:
-                    query += ' WHERE ' + ' AND '.join(conditions)
+                # Write-only sheets emit column widths before any row, so size them
+                # up front from the column lengths (no ORDER BY needed for that)
+                width_query = 'SELECT ' + ', '.join(
+                    f'COALESCE(MAX(LENGTH({header})), 0)' for header in headers
+                ) + f' FROM ({EXCEL_EXPORT_SQL}{where_clause})'
+                data_widths = conn.execute(width_query, params).fetchone()
                 
-                query += ' ORDER BY created_at DESC'
+                # openpyxl is only imported once an Excel export actually runs
+                import openpyxl
+                from openpyxl.cell import WriteOnlyCell
+                from openpyxl.styles import Font, PatternFill, Alignment
                 
-                df = pd.read_sql_query(query, conn, params=params)
+                # Create Excel workbook, streaming rows instead of holding every cell
+                workbook = openpyxl.Workbook(write_only=True)
+                worksheet = workbook.create_sheet('UI Elements')
                 
-                # Create Excel workbook
-                with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                    # Main data sheet
-                    df.to_excel(writer, sheet_name='UI Elements', index=False)
-                    
-                    # Summary sheet
-                    summary_data = self._create_summary_data(df)
-                    summary_df = pd.DataFrame(summary_data)
-                    summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                    
-                    # Safety analysis sheet
-                    safety_analysis = df.groupby('safety_level').size().reset_index(name='count')
-                    safety_analysis.to_excel(writer, sheet_name='Safety Analysis', index=False)
-                    
-                    # Format the main sheet
-                    workbook = writer.book
-                    worksheet = writer.sheets['UI Elements']
-                    
-                    # Header formatting
-                    header_font = Font(bold=True, color="FFFFFF")
-                    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-                    
-                    for col_num, value in enumerate(df.columns.values):
-                        cell = worksheet.cell(row=1, column=col_num + 1)
-                        cell.font = header_font
-                        cell.fill = header_fill
-                        cell.alignment = Alignment(horizontal="center")
-                    
-                    # Auto-adjust column widths
-                    for column in worksheet.columns:
-                        max_length = 0
-                        column_letter = column[0].column_letter
-                        for cell in column:
-                            try:
-                                if len(str(cell.value)) > max_length:
-                                    max_length = len(str(cell.value))
-                            except:
-                                pass
-                        adjusted_width = min(max_length + 2, 50)
-                        worksheet.column_dimensions[column_letter].width = adjusted_width
-                    
-                    # Color code safety levels
-                    safety_colors = {
-                        'HIGH_RISK': 'FFCCCC',  # Light red
-                        'MEDIUM_RISK': 'FFFFCC',  # Light yellow
-                        'LOW_RISK': 'CCFFCC',  # Light green
-                        'SAFE': 'CCE5FF'  # Light blue
-                    }
+                # Auto-adjust column widths
+                self._fit_column_widths(
+                    worksheet, [max(len(header), width) for header, width in zip(headers, data_widths)]
+                )
+                
+                # Header formatting
+                header_font = Font(bold=True, color="FFFFFF")
+                header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+                header_alignment = Alignment(horizontal="center")
+                
+                header_row = []
+                for header in headers:
+                    cell = WriteOnlyCell(worksheet, value=header)
+                    cell.font = header_font
+                    cell.fill = header_fill
+                    cell.alignment = header_alignment
+                    header_row.append(cell)
+                worksheet.append(header_row)
+                
+                # Color code safety levels. Style one cell per level and copy its style
+                # array onto each cell of matching rows, so openpyxl registers each
+                # fill once per workbook instead of hashing it again for every cell.
+                safety_styles = {}
+                for level, fill in _safety_fills().items():
+                    template = WriteOnlyCell(worksheet)
+                    template.fill = fill
+                    safety_styles[level] = template._style
+                
+                safety_col = headers.index('safety_level')
+                record_count = 0
+                
+                for rows in _prefetch_batches(cursor, chunk_size):
+                    for row in rows:
+                        style = safety_styles.get(row[safety_col])
+                        if style is None:
+                            worksheet.append(row)
+                        else:
+                            cells = []
+                            for value in row:
+                                cell = WriteOnlyCell(worksheet, value=value)
+                                cell._style = copy(style)
+                                cells.append(cell)
+                            worksheet.append(cells)
                     
-                    safety_col = df.columns.get_loc('safety_level') + 1
-                    for row_num in range(2, len(df) + 2):
-                        safety_value = worksheet.cell(row=row_num, column=safety_col).value
-                        if safety_value in safety_colors:
-                            fill = PatternFill(start_color=safety_colors[safety_value], 
-                                             end_color=safety_colors[safety_value], 
-                                             fill_type="solid")
-                            for col in range(1, len(df.columns) + 1):
-                                worksheet.cell(row=row_num, column=col).fill = fill
+                    record_count += len(rows)
+                
+                # Summary sheet
+                summary_sheet = workbook.create_sheet('Summary')
+                summary_data = self._create_summary_data_sql(conn, where_clause, params)
+                if summary_data:
+                    self._write_small_sheet(
+                        summary_sheet, ['Metric', 'Value'],
+                        [(item['Metric'], item['Value']) for item in summary_data]
+                    )
+                
+                # Safety analysis sheet
+                analysis_sheet = workbook.create_sheet('Safety Analysis')
+                self._write_small_sheet(
+                    analysis_sheet, ['safety_level', 'count'],
+                    conn.execute(f'''
+                        SELECT safety_level, COUNT(*) FROM ui_elements{where_clause}
+                        GROUP BY safety_level HAVING safety_level IS NOT NULL
+                        ORDER BY safety_level
+                    ''', params).fetchall()
+                )
+                
+                workbook.save(output_path)
                 
                 # Record export history
-                self._record_export(output_path, 'Excel', len(df), filters)
+                self._record_export(output_path, 'Excel', record_count, filters)
+                
+                self.logger.info("Exported %s records to Excel: %s", record_count, output_path)
+                return record_count
+            
+        except Exception as e:
+            self.logger.error("Excel export failed: %s", e)
+            return 0
+    
+    def export_snapshot(self, output_path, filters=None, chunk_size=None):
+        """
+        Export the whole database as a compacted SQLite file with VACUUM INTO
+        
+        Pages are copied straight to the new file with no row formatting, so this
+        is the fastest way to hand over everything. Filters are not applied.
+        
+        Args:
+            output_path: Output .db file path (replaced if it exists)
+            filters: Ignored; the snapshot always holds every table
+            chunk_size: Ignored; accepted for the export_elements_to_file signature
+            
+        Returns:
+            int: Number of UI elements in the snapshot
+        """
+        try:
+            if os.path.abspath(output_path) == os.path.abspath(self._db_path_str):
+                raise ValueError("Snapshot path is the database itself")
+            if filters:
+                self.logger.warning("Filters are ignored for SQLite snapshot exports")
+            
+            with self._reader() as conn:
+                record_count = conn.execute('SELECT COUNT(*) FROM ui_elements').fetchone()[0]
                 
-                self.logger.info(f"Exported {len(df)} records to Excel: {output_path}")
-                return len(df)
+                # VACUUM INTO refuses to overwrite, so clear any earlier export first
+                Path(output_path).unlink(missing_ok=True)
+                conn.execute('VACUUM INTO ?', (str(output_path),))
                 
+                # Record export history
+                self._record_export(output_path, 'SQLite', record_count, {})
+                
+                self.logger.info("Exported %s records to SQLite snapshot: %s", record_count, output_path)
+                return record_count
+            
         except Exception as e:
-            self.logger.error(f"Excel export failed: {e}")
+            self.logger.error("SQLite snapshot export failed: %s", e)
             return 0
     
     def export_test_cases(self, output_path, format='excel'):
         """Export test cases and steps"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 # Get test cases with step counts
                 test_cases_query = '''
                     SELECT 
@@ -503,7 +1051,6 @@ class DatabaseManager:
                     ORDER BY tc.created_at DESC
                 '''
                 
-                test_cases_df = pd.read_sql_query(test_cases_query, conn)
                 
                 # Get test steps
                 test_steps_query = '''
@@ -515,82 +1062,150 @@ class DatabaseManager:
                     ORDER BY tc.name, ts.step_order
                 '''
                 
-                test_steps_df = pd.read_sql_query(test_steps_query, conn)
-                
                 if format.lower() == 'excel':
-                    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                        test_cases_df.to_excel(writer, sheet_name='Test Cases', index=False)
-                        test_steps_df.to_excel(writer, sheet_name='Test Steps', index=False)
+                    import openpyxl
+                    workbook = openpyxl.Workbook(write_only=True)
+                    test_case_count = self._append_query_rows(
+                        workbook.create_sheet('Test Cases'), conn.execute(test_cases_query)
+                    )
+                    self._append_query_rows(
+                        workbook.create_sheet('Test Steps'), conn.execute(test_steps_query)
+                    )
+                    workbook.save(output_path)
                 else:
                     # CSV export (two files)
                     base_path = Path(output_path)
                     cases_path = base_path.with_suffix('.cases.csv')
                     steps_path = base_path.with_suffix('.steps.csv')
                     
-                    test_cases_df.to_csv(cases_path, index=False)
-                    test_steps_df.to_csv(steps_path, index=False)
-                
-                self._record_export(output_path, f'Test Cases ({format})', len(test_cases_df), {})
+                    test_case_count = self._write_csv(conn.execute(test_cases_query), cases_path)
+                    self._write_csv(conn.execute(test_steps_query), steps_path)
                 
-                self.logger.info(f"Exported {len(test_cases_df)} test cases to {format}: {output_path}")
-                return len(test_cases_df)
+                self._record_export(output_path, f'Test Cases ({format})', test_case_count, {})
                 
+                self.logger.info("Exported %s test cases to %s: %s", test_case_count, format, output_path)
+                return test_case_count
+            
         except Exception as e:
-            self.logger.error(f"Test cases export failed: {e}")
+            self.logger.error("Test cases export failed: %s", e)
             return 0
     
-    def _create_summary_data(self, df):
-        """Create summary statistics for export"""
-        if df.empty:
-            return []
+    def _has_matching_elements(self, conn, where_clause, params):
+        """Check whether any UI element matches an export filter, stopping at the first hit"""
+        return conn.execute(
+            f'SELECT EXISTS (SELECT 1 FROM ui_elements{where_clause})', params
+        ).fetchone()[0] == 1
+    
+    def _write_csv(self, cursor, output_path, chunk_size=EXPORT_BATCH_SIZE):
+        """Stream an executed query's header and rows to a CSV file, returning the row count"""
+        record_count = 0
+        with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow([description[0] for description in cursor.description])
+            for rows in _prefetch_batches(cursor, chunk_size):
+                writer.writerows(rows)
+                record_count += len(rows)
+        return record_count
+    
+    def _append_query_rows(self, worksheet, cursor, chunk_size=EXPORT_BATCH_SIZE):
+        """Stream an executed query's header and rows into a write-only sheet, returning the row count"""
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
         
-        summary = [
-            {'Metric': 'Total Elements', 'Value': len(df)},
-            {'Metric': 'Unique Apps', 'Value': df['app_name'].nunique()},
-            {'Metric': 'Unique Screens', 'Value': df['screen_name'].nunique()},
-            {'Metric': 'Clickable Elements', 'Value': df['clickable'].sum()},
-            {'Metric': 'Safe Elements', 'Value': (df['safety_level'] == 'SAFE').sum()},
-            {'Metric': 'High Risk Elements', 'Value': (df['safety_level'] == 'HIGH_RISK').sum()},
-            {'Metric': 'Automation Ready', 'Value': df['automation_allowed'].sum()},
-        ]
+        header_font = Font(bold=True)
+        header_row = []
+        for description in cursor.description:
+            cell = WriteOnlyCell(worksheet, value=description[0])
+            cell.font = header_font
+            header_row.append(cell)
+        worksheet.append(header_row)
         
-        # Add date range
-        if 'created_at' in df.columns:
-            summary.extend([
-                {'Metric': 'Date Range Start', 'Value': df['created_at'].min()},
-                {'Metric': 'Date Range End', 'Value': df['created_at'].max()},
-            ])
+        record_count = 0
+        for rows in _prefetch_batches(cursor, chunk_size):
+            for row in rows:
+                worksheet.append(row)
+            record_count += len(rows)
+        return record_count
+    
+    def _fit_column_widths(self, worksheet, widths):
+        """Set column widths from the longest value per column, capped at 50"""
+        from openpyxl.utils import get_column_letter
+        for col_num, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[get_column_letter(col_num)].width = min(width + 2, 50)
+    
+    def _write_small_sheet(self, worksheet, headers, rows):
+        """Write an in-memory sheet, sizing its columns from the same values"""
+        widths = [len(header) for header in headers]
+        for row in rows:
+            for col_index, value in enumerate(row):
+                length = len(str(value))
+                if length > widths[col_index]:
+                    widths[col_index] = length
         
-        return summary
+        self._fit_column_widths(worksheet, widths)
+        worksheet.append(headers)
+        for row in rows:
+            worksheet.append(row)
+    
+    def _create_summary_data_sql(self, conn, where_clause, params):
+        """Create summary statistics for export with one aggregate query"""
+        (total, apps, screens, clickable, safe, high_risk,
+         automation_ready, date_start, date_end) = conn.execute(f'''
+            SELECT
+                COUNT(*),
+                COUNT(DISTINCT app_name),
+                COUNT(DISTINCT screen_name),
+                COALESCE(SUM(clickable), 0),
+                COALESCE(SUM(safety_level = 'SAFE'), 0),
+                COALESCE(SUM(safety_level = 'HIGH_RISK'), 0),
+                COALESCE(SUM(automation_allowed), 0),
+                MIN(created_at),
+                MAX(created_at)
+            FROM ui_elements{where_clause}
+        ''', params).fetchone()
+        
+        if not total:
+            return []
+        
+        return [
+            {'Metric': 'Total Elements', 'Value': total},
+            {'Metric': 'Unique Apps', 'Value': apps},
+            {'Metric': 'Unique Screens', 'Value': screens},
+            {'Metric': 'Clickable Elements', 'Value': clickable},
+            {'Metric': 'Safe Elements', 'Value': safe},
+            {'Metric': 'High Risk Elements', 'Value': high_risk},
+            {'Metric': 'Automation Ready', 'Value': automation_ready},
+            {'Metric': 'Date Range Start', 'Value': date_start},
+            {'Metric': 'Date Range End', 'Value': date_end},
+        ]
     
     def _record_export(self, file_path, export_type, record_count, filters):
         """Record export operation in history"""
         try:
-            file_size = Path(file_path).stat().st_size if Path(file_path).exists() else 0
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                file_size = 0
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_lock, self._write_conn as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO export_history 
-                    (export_type, file_path, record_count, filters_applied, file_size_bytes, exported_by)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
+                cursor.execute(INSERT_EXPORT_SQL, (
                     export_type,
                     str(file_path),
                     record_count,
-                    json.dumps(filters or {}),
+                    _json_dumps(filters or {}),
                     file_size,
                     'System'
                 ))
                 conn.commit()
                 
         except Exception as e:
-            self.logger.warning(f"Failed to record export history: {e}")
+            self.logger.warning("Failed to record export history: %s", e)
     
     def get_export_history(self, limit=20):
         """Get recent export history"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._reader() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT export_type, file_path, export_timestamp, record_count, file_size_bytes
@@ -600,77 +1215,111 @@ class DatabaseManager:
                 ''', (limit,))
                 
                 return cursor.fetchall()
-                
+            
         except Exception as e:
-            self.logger.error(f"Failed to get export history: {e}")
+            self.logger.error("Failed to get export history: %s", e)
             return []
     
     def cleanup_old_data(self, days_to_keep=30):
         """Clean up old scan data to keep database size manageable"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+            # Computed in SQL so it matches the UTC CURRENT_TIMESTAMP format of the stored rows
+            cutoff = f'-{int(days_to_keep)} days'
             
-            with sqlite3.connect(self.db_path) as conn:
+            with self._write_lock, self._write_conn as conn:
                 cursor = conn.cursor()
+                cursor.execute('BEGIN IMMEDIATE')
                 
                 # Delete old scan sessions and related elements
                 cursor.execute('''
                     DELETE FROM ui_elements 
-                    WHERE created_at < ?
-                ''', (cutoff_date,))
+                    WHERE created_at < datetime('now', ?)
+                ''', (cutoff,))
+                elements_deleted = cursor.rowcount
                 
                 cursor.execute('''
                     DELETE FROM scan_sessions 
-                    WHERE scan_timestamp < ?
-                ''', (cutoff_date,))
+                    WHERE scan_timestamp < datetime('now', ?)
+                ''', (cutoff,))
+                sessions_deleted = cursor.rowcount
                 
                 # Clean up old export history
                 cursor.execute('''
                     DELETE FROM export_history 
-                    WHERE export_timestamp < ?
-                ''', (cutoff_date,))
+                    WHERE export_timestamp < datetime('now', ?)
+                ''', (cutoff,))
+                exports_deleted = cursor.rowcount
                 
-                deleted_count = cursor.rowcount
                 conn.commit()
                 
-                self.logger.info(f"Cleaned up {deleted_count} old records")
+                # Hand freed pages back to the filesystem when the file allows it
+                if cursor.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+                    cursor.execute('PRAGMA incremental_vacuum')
+                
+                deleted_count = elements_deleted + sessions_deleted + exports_deleted
+                self.logger.info(
+                    "Cleaned up %s old records (%s elements, %s scan sessions, %s export records)",
+                    deleted_count, elements_deleted, sessions_deleted, exports_deleted
+                )
                 return deleted_count
                 
         except Exception as e:
-            self.logger.error(f"Data cleanup failed: {e}")
+            self.logger.error("Data cleanup failed: %s", e)
             return 0
     
     def get_database_stats(self):
         """Get database statistics"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._reader() as conn:
+                # Table counts and date range from one statement (one consistent snapshot);
+                # MIN and MAX sit in their own subqueries so each is a single index lookup
+                row = conn.execute(DATABASE_STATS_SQL).fetchone()
                 
-                stats = {}
-                
-                # Table counts
-                tables = ['ui_elements', 'test_cases', 'test_steps', 'test_executions', 'scan_sessions']
-                for table in tables:
-                    cursor.execute(f'SELECT COUNT(*) FROM {table}')
-                    stats[f'{table}_count'] = cursor.fetchone()[0]
+                stats = {
+                    f'{table}_count': count for table, count in zip(STATS_TABLES, row)
+                }
                 
-                # Database size
-                stats['database_size_mb'] = self.db_path.stat().st_size / (1024 * 1024)
+                # Database size, counting pages still waiting in the write-ahead log
+                size_bytes = os.stat(self._db_path_str).st_size
+                try:
+                    size_bytes += os.stat(self._db_path_str + '-wal').st_size
+                except FileNotFoundError:
+                    pass
+                stats['database_size_mb'] = size_bytes / (1024 * 1024)
                 
                 # Date ranges
-                cursor.execute('SELECT MIN(created_at), MAX(created_at) FROM ui_elements')
-                date_range = cursor.fetchone()
                 stats['data_date_range'] = {
-                    'start': date_range[0],
-                    'end': date_range[1]
+                    'start': row[-2],
+                    'end': row[-1]
                 }
                 
                 return stats
-                
+            
         except Exception as e:
-            self.logger.error(f"Failed to get database stats: {e}")
+            self.logger.error("Failed to get database stats: %s", e)
             return {}
 
+# export_elements_to_file format -> DatabaseManager export method
+EXPORT_FORMATS = {
+    'csv': DatabaseManager.export_to_csv,
+    'excel': DatabaseManager.export_to_excel,
+    'sqlite': DatabaseManager.export_snapshot,
+}
+
+# One shared manager per database file, so the convenience functions below
+# reuse open connections instead of reconnecting and re-running schema setup
+_manager_cache = {}
+_manager_cache_lock = threading.Lock()
+
+def _get_database_manager(db_path):
+    """Get the shared DatabaseManager for a database file"""
+    key = os.path.abspath(db_path)
+    with _manager_cache_lock:
+        db_manager = _manager_cache.get(key)
+        if db_manager is None:
+            db_manager = _manager_cache[key] = DatabaseManager(db_path)
+    return db_manager
+
 # Integration functions for main application
 def save_scan_to_database(scan_results, db_path="mobile_tests.db"):
     """
@@ -684,91 +1333,111 @@ def save_scan_to_database(scan_results, db_path="mobile_tests.db"):
         str: Scan ID if successful, None if failed
     """
     try:
-        db_manager = DatabaseManager(db_path)
+        db_manager = _get_database_manager(db_path)
         return db_manager.save_scan_results(scan_results)
     except Exception as e:
-        logging.error(f"Failed to save scan to database: {e}")
+        logging.error("Failed to save scan to database: %s", e)
         return None
 
-def export_elements_to_file(output_path, format='csv', filters=None, db_path="mobile_tests.db"):
+def export_elements_to_file(output_path, format='csv', filters=None, db_path="mobile_tests.db",
+                            chunk_size=EXPORT_BATCH_SIZE):
     """
     Convenience function to export elements
     
     Args:
         output_path: Output file path
-        format: 'csv' or 'excel'
+        format: 'csv', 'excel' or 'sqlite' (whole-database snapshot, filters ignored)
         filters: Export filters
         db_path: Database file path
+        chunk_size: Rows fetched and written per batch
         
     Returns:
         int: Number of records exported
     """
     try:
-        db_manager = DatabaseManager(db_path)
-        
-        if format.lower() == 'csv':
-            return db_manager.export_to_csv(output_path, filters)
-        elif format.lower() == 'excel':
-            return db_manager.export_to_excel(output_path, filters)
-        else:
+        # Validate the format before opening the database
+        export = EXPORT_FORMATS.get(format.lower())
+        if export is None:
             raise ValueError(f"Unsupported format: {format}")
-            
+        
+        return export(_get_database_manager(db_path), output_path, filters, chunk_size=chunk_size)
+        
     except Exception as e:
-        logging.error(f"Failed to export elements: {e}")
+        logging.error("Failed to export elements: %s", e)
         return 0
 
-if __name__ == "__main__":
-    # Test the database manager
+if __name__ == "__main__" and os.getenv('RUN_SMOKE'):
+    # Smoke test the database manager (set RUN_SMOKE=1). Everything goes to a
+    # temporary directory, so runs never reuse or grow an earlier database.
     logging.basicConfig(level=logging.INFO)
     
-    db_manager = DatabaseManager("test_mobile.db")
-    
-    # Test data
-    test_scan_results = {
-        'app_name': 'Test Banking App',
-        'screen_name': 'Login Screen',
-        'scan_duration': 2.5,
-        'elements': [
-            {
-                'class_name': 'android.widget.EditText',
-                'resource_id': 'com.bank.app:id/username',
-                'text': '',
-                'content_desc': 'Username field',
-                'bounds': '[100,200][400,250]',
-                'clickable': True,
-                'enabled': True,
-                'displayed': True,
-                'password': False,
-                'locators': {
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_manager = DatabaseManager(os.path.join(temp_dir, "test_mobile.db"))
+        
+        # Test data
+        test_scan_results = {
+            'app_name': 'Test Banking App',
+            'screen_name': 'Login Screen',
+            'scan_duration': 2.5,
+            'elements': [
+                {
+                    'class_name': 'android.widget.EditText',
                     'resource_id': 'com.bank.app:id/username',
-                    'xpath_resource_id': '//*[@resource-id="com.bank.app:id/username"]'
-                },
-                'safety_classification': {
-                    'level': 'MEDIUM_RISK',
-                    'reason': 'Login field requires caution',
-                    'automation_allowed': True
-                },
-                'automation_notes': ['Use test credentials only'],
-                'detection_method': 'resource_id'
-            }
-        ],
-        'metadata': {
-            'screenshot_path': '/screenshots/test.png'
-        },
-        'statistics': {
-            'total_elements': 1
-        },
-        'warnings': ['Test warning']
-    }
-    
-    # Test save
-    scan_id = db_manager.save_scan_results(test_scan_results)
-    print(f"Saved scan with ID: {scan_id}")
-    
-    # Test export
-    exported = db_manager.export_to_csv("test_export.csv")
-    print(f"Exported {exported} records to CSV")
-    
-    # Test stats
-    stats = db_manager.get_database_stats()
-    print(f"Database stats: {stats}")
\ No newline at end of file
+                    'text': '',
+                    'content_desc': 'Username field',
+                    'bounds': '[100,200][400,250]',
+                    'clickable': True,
+                    'enabled': True,
+                    'displayed': True,
+                    'password': False,
+                    'locators': {
+                        'resource_id': 'com.bank.app:id/username',
+                        'xpath_resource_id': '//*[@resource-id="com.bank.app:id/username"]'
+                    },
+                    'safety_classification': {
+                        'level': 'MEDIUM_RISK',
+                        'reason': 'Login field requires caution',
+                        'automation_allowed': True
+                    },
+                    'automation_notes': ['Use test credentials only'],
+                    'detection_method': 'resource_id'
+                }
+            ],
+            'metadata': {
+                'screenshot_path': '/screenshots/test.png'
+            },
+            'statistics': {
+                'total_elements': 1
+            },
+            'warnings': ['Test warning']
+        }
+        
+        # Test save
+        scan_id = db_manager.save_scan_results(test_scan_results)
+        print(f"Saved scan with ID: {scan_id}")
+        
+        # Test DataFrame bulk insert (pandas is optional here)
+        try:
+            import pandas as pd
+        except ImportError:
+            pd = None
+        if pd is not None:
+            df = pd.DataFrame({
+                'app_name': 'Test Banking App',
+                'screen_name': 'List Screen',
+                'element_type': 'android.widget.TextView',
+                'text_content': [f'Row {i}' for i in range(1200)],
+                'bounds': [f'[0,{i}][10,{i + 1}]' for i in range(1200)],
+            })
+            saved = db_manager.save_elements_df(df, scan_id)
+            print(f"Saved {saved} elements from a DataFrame")
+        
+        # Test export
+        exported = db_manager.export_to_csv(os.path.join(temp_dir, "test_export.csv"))
+        print(f"Exported {exported} records to CSV")
+        
+        # Test stats
+        stats = db_manager.get_database_stats()
+        print(f"Database stats: {stats}")
+        
+        db_manager.close()
@@ -5,38 +5,145 @@ Advanced element detection and banking-specific safety classification
 
 import time
 import logging
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
-from appium.webdriver.common.appiumby import AppiumBy
+from dataclasses import dataclass
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import xml.etree.ElementTree as ET
 import re
+from collections import Counter
+
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Risk levels checked by _classify_element_safety, most severe first
+RISK_LEVELS = ('HIGH_RISK', 'MEDIUM_RISK', 'LOW_RISK')
+
+CLASSIFICATION_CACHE_SIZE = 4096
+
+# Keywords that flag an element as transaction-related in the scan warnings
+TRANSACTION_KEYWORDS = ('transfer', 'send', 'pay', 'amount', 'confirm')
+
+# Characters not allowed in screenshot file names
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w\-_\.]')
+
+# Widget classes detected as interactive even when not marked clickable
+INPUT_CLASS = 'android.widget.EditText'
+BUTTON_CLASS = 'android.widget.Button'
+INTERACTIVE_CLASSES = frozenset((INPUT_CLASS, BUTTON_CLASS))
+
+# Common banking element patterns: (attribute, substring, equivalent XPath).
+# Matching is case-sensitive, like XPath contains(); the XPath is kept as the
+# element's detection info.
+BANKING_PATTERNS = tuple(
+    (attr, pattern, f"//*[contains(@{attr}, '{pattern}')]")
+    for attr, patterns in (
+        ('resource-id', ('login', 'password', 'username', 'pin', 'balance', 'account',
+                         'transfer', 'payment', 'menu', 'settings', 'help')),
+        ('text', ('Login', 'Menu', 'Settings', 'Help', 'Transfer')),
+        ('content-desc', ('menu', 'settings', 'help')),
+    )
+    for pattern in patterns
+)
+
+@dataclass
+class XmlElementSnapshot:
+    """Tag and attributes of a page-source node, kept after the parser frees it"""
+    __slots__ = ('tag', 'attrib')
+    tag: str
+    attrib: dict
+
+def _iter_page_source(page_source):
+    """
+    Stream page-source nodes in document order as (element, path) pairs
+    
+    path is the live list of tags from the root down to the element. Each
+    element is cleared once its subtree has been read, so callers must copy
+    what they need before moving on.
+    """
+    # lxml's C parser when installed; it needs bytes when the source carries
+    # an encoding declaration, as Appium's does
+    etree = LET if LET is not None else ET
+    path = []
+    for event, elem in etree.iterparse(BytesIO(page_source.encode('utf-8')), events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            yield elem, path
+        else:
+            path.pop()
+            elem.clear()
+
+def _build_pattern_automaton(banking_patterns):
+    """
+    Build an Aho-Corasick automaton over every banking pattern, or None
+    without pyahocorasick
+    
+    Each pattern maps to (severity rank, list position, level, pattern), so the
+    smallest match is the one the level-by-level checks would report.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, level in enumerate(RISK_LEVELS):
+        for position, pattern in enumerate(banking_patterns[level]):
+            if pattern not in automaton:
+                automaton.add_word(pattern, (rank, position, level, pattern))
+    automaton.make_automaton()
+    return automaton
+
+def _interaction_type(element):
+    """How a processed element is interacted with: clickable, input or display"""
+    if element.get('clickable'):
+        return 'clickable'
+    elif 'EditText' in element.get('class_name', ''):
+        return 'input'
+    else:
+        return 'display'
+
+def _has_stable_locator(element):
+    """Whether a processed element has a resource-id or accessibility-id locator"""
+    locators = element.get('locators', {})
+    return bool(locators.get('resource_id') or locators.get('accessibility_id'))
 
 class BankingElementScanner:
+    # Banking-specific element patterns, shared by every scanner
+    banking_patterns = {
+        'HIGH_RISK': (
+            'transfer', 'send', 'pay', 'withdraw', 'deposit', 'confirm', 'authorize', 
+            'submit', 'execute', 'password', 'pin', 'cvv', 'otp', 'token', 'biometric',
+            'fingerprint', 'face', 'transaction', 'amount', 'balance', 'account'
+        ),
+        'MEDIUM_RISK': (
+            'login', 'sign', 'authenticate', 'verify', 'profile', 'settings', 
+            'statement', 'history', 'details', 'information', 'search'
+        ),
+        'LOW_RISK': (
+            'menu', 'home', 'back', 'close', 'help', 'about', 'contact', 'support',
+            'news', 'notification', 'language', 'theme', 'version'
+        )
+    }
+    # Built once at import, since perform_advanced_scan creates a scanner per scan
+    _pattern_automaton = _build_pattern_automaton(banking_patterns)
+    
     def __init__(self, driver, screenshots_dir):
         self.driver = driver
         self.screenshots_dir = Path(screenshots_dir)
         self.logger = logging.getLogger(__name__)
         self.wait = WebDriverWait(driver, 10)
         
-        # Banking-specific element patterns
-        self.banking_patterns = {
-            'HIGH_RISK': [
-                'transfer', 'send', 'pay', 'withdraw', 'deposit', 'confirm', 'authorize', 
-                'submit', 'execute', 'password', 'pin', 'cvv', 'otp', 'token', 'biometric',
-                'fingerprint', 'face', 'transaction', 'amount', 'balance', 'account'
-            ],
-            'MEDIUM_RISK': [
-                'login', 'sign', 'authenticate', 'verify', 'profile', 'settings', 
-                'statement', 'history', 'details', 'information', 'search'
-            ],
-            'LOW_RISK': [
-                'menu', 'home', 'back', 'close', 'help', 'about', 'contact', 'support',
-                'news', 'notification', 'language', 'theme', 'version'
-            ]
-        }
+        # Device and app info from the session capabilities, read on first scan
+        self._session_info = None
+        self._classification_cache = {}
     
     def scan_current_screen(self, app_name="Unknown App", screen_name="Unknown Screen"):
         """
@@ -70,14 +177,9 @@ class BankingElementScanner:
             page_source = self.driver.page_source
             scan_results['metadata']['page_source_length'] = len(page_source)
             
-            # Method 1: Find all interactive elements
-            interactive_elements = self._find_interactive_elements()
-            
-            # Method 2: Parse XML hierarchy for comprehensive detection
-            xml_elements = self._parse_xml_hierarchy(page_source)
-            
-            # Method 3: Find elements by common banking patterns
-            pattern_elements = self._find_elements_by_patterns()
+            # Find interactive elements, elements with useful attributes and
+            # elements matching banking patterns in one pass over the source
+            interactive_elements, xml_elements, pattern_elements = self._scan_page_source(page_source)
             
             # Combine and deduplicate elements
             all_elements = self._merge_and_deduplicate(
@@ -120,20 +222,11 @@ class BankingElementScanner:
         }
         
         try:
-            # Device information
-            metadata['device_info'] = {
-                'platform_name': self.driver.capabilities.get('platformName', 'Unknown'),
-                'platform_version': self.driver.capabilities.get('platformVersion', 'Unknown'),
-                'device_name': self.driver.capabilities.get('deviceName', 'Unknown'),
-                'device_udid': self.driver.capabilities.get('udid', 'Unknown'),
-            }
-            
-            # App information
-            metadata['app_info'] = {
-                'app_package': self.driver.capabilities.get('appPackage', 'Unknown'),
-                'app_activity': self.driver.capabilities.get('appActivity', 'Unknown'),
-                'automation_name': self.driver.capabilities.get('automationName', 'Unknown'),
-            }
+            # Device and app information (fixed for the session); copied so
+            # scan results never share dicts
+            device_info, app_info = self._get_session_info()
+            metadata['device_info'] = dict(device_info)
+            metadata['app_info'] = dict(app_info)
             
             # Current screen information
             try:
@@ -158,11 +251,34 @@ class BankingElementScanner:
             
         return metadata
     
+    def _get_session_info(self):
+        """Device and app information from the driver capabilities, read once per scanner"""
+        if self._session_info is None:
+            capabilities = self.driver.capabilities
+            
+            # Device information
+            device_info = {
+                'platform_name': capabilities.get('platformName', 'Unknown'),
+                'platform_version': capabilities.get('platformVersion', 'Unknown'),
+                'device_name': capabilities.get('deviceName', 'Unknown'),
+                'device_udid': capabilities.get('udid', 'Unknown'),
+            }
+            
+            # App information
+            app_info = {
+                'app_package': capabilities.get('appPackage', 'Unknown'),
+                'app_activity': capabilities.get('appActivity', 'Unknown'),
+                'automation_name': capabilities.get('automationName', 'Unknown'),
+            }
+            
+            self._session_info = (device_info, app_info)
+        return self._session_info
+    
     def _take_screenshot(self, app_name, screen_name):
         """Take and save screenshot"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_app_name = re.sub(r'[^\w\-_\.]', '_', app_name)
-        safe_screen_name = re.sub(r'[^\w\-_\.]', '_', screen_name)
+        safe_app_name = _UNSAFE_FILENAME_CHARS.sub('_', app_name)
+        safe_screen_name = _UNSAFE_FILENAME_CHARS.sub('_', screen_name)
         
         screenshot_filename = f"{safe_app_name}_{safe_screen_name}_{timestamp}.png"
         screenshot_path = self.screenshots_dir / screenshot_filename
@@ -176,116 +292,82 @@ class BankingElementScanner:
             
         return screenshot_path
     
-    def _find_interactive_elements(self):
-        """Find all interactive elements (clickable, editable)"""
-        elements = []
+    def _scan_page_source(self, page_source):
+        """
+        Run every element detector over the page source in a single pass
         
-        try:
-            # Find clickable elements
-            clickable_elements = self.driver.find_elements(AppiumBy.XPATH, "//*[@clickable='true']")
-            for elem in clickable_elements:
-                elements.append(('interactive', elem, 'clickable'))
-            
-            # Find input elements
-            input_elements = self.driver.find_elements(AppiumBy.XPATH, "//android.widget.EditText")
-            for elem in input_elements:
-                elements.append(('interactive', elem, 'input'))
-            
-            # Find buttons
-            button_elements = self.driver.find_elements(AppiumBy.XPATH, "//android.widget.Button")
-            for elem in button_elements:
-                elements.append(('interactive', elem, 'button'))
-                
-        except Exception as e:
-            self.logger.warning(f"Failed to find interactive elements: {e}")
-            
-        return elements
-    
-    def _parse_xml_hierarchy(self, page_source):
-        """Parse XML page source for comprehensive element detection"""
-        elements = []
+        Returns:
+            tuple: (interactive, xml, pattern) element lists, each grouped and
+            ordered the way the separate server queries used to return them
+        """
+        clickable_elements = []
+        input_elements = []
+        button_elements = []
+        xml_elements = []
+        # One bucket per banking pattern, in pattern order
+        pattern_buckets = [[] for _ in BANKING_PATTERNS]
         
         try:
-            # Parse XML
-            root = ET.fromstring(page_source)
-            
-            # Recursively find all elements with useful attributes
-            def traverse_element(xml_elem, path=""):
-                current_path = f"{path}/{xml_elem.tag}" if path else xml_elem.tag
+            # Streamed, so each node is freed once read; nodes a detector keeps
+            # are copied into one snapshot shared by every list they land in
+            for xml_elem, path in _iter_page_source(page_source):
+                tag = xml_elem.tag
+                attrib = xml_elem.attrib
+                elem = None
                 
-                # Check if element has useful attributes
-                if self._has_useful_attributes(xml_elem.attrib):
-                    elements.append(('xml', xml_elem, current_path))
+                # Method 1: interactive elements, matching //*[@clickable='true'],
+                # //android.widget.EditText and //android.widget.Button
+                is_clickable = attrib.get('clickable') == 'true'
+                if is_clickable or tag in INTERACTIVE_CLASSES:
+                    elem = XmlElementSnapshot(tag, dict(attrib))
+                    if is_clickable:
+                        clickable_elements.append(('interactive', elem, 'clickable'))
+                    if tag == INPUT_CLASS:
+                        input_elements.append(('interactive', elem, 'input'))
+                    elif tag == BUTTON_CLASS:
+                        button_elements.append(('interactive', elem, 'button'))
                 
-                # Traverse children
-                for child in xml_elem:
-                    traverse_element(child, current_path)
-            
-            traverse_element(root)
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to parse XML hierarchy: {e}")
-            
-        return elements
-    
-    def _find_elements_by_patterns(self):
-        """Find elements using banking-specific patterns"""
-        elements = []
-        
-        banking_xpaths = [
-            # Common banking element patterns
-            "//*[contains(@resource-id, 'login')]",
-            "//*[contains(@resource-id, 'password')]",
-            "//*[contains(@resource-id, 'username')]",
-            "//*[contains(@resource-id, 'pin')]",
-            "//*[contains(@resource-id, 'balance')]",
-            "//*[contains(@resource-id, 'account')]",
-            "//*[contains(@resource-id, 'transfer')]",
-            "//*[contains(@resource-id, 'payment')]",
-            "//*[contains(@resource-id, 'menu')]",
-            "//*[contains(@resource-id, 'settings')]",
-            "//*[contains(@resource-id, 'help')]",
-            "//*[contains(@text, 'Login')]",
-            "//*[contains(@text, 'Menu')]",
-            "//*[contains(@text, 'Settings')]",
-            "//*[contains(@text, 'Help')]",
-            "//*[contains(@text, 'Transfer')]",
-            "//*[contains(@content-desc, 'menu')]",
-            "//*[contains(@content-desc, 'settings')]",
-            "//*[contains(@content-desc, 'help')]",
-        ]
-        
-        for xpath in banking_xpaths:
-            try:
-                found_elements = self.driver.find_elements(AppiumBy.XPATH, xpath)
-                for elem in found_elements:
-                    elements.append(('pattern', elem, xpath))
-            except:
-                continue
+                # Method 2: XML hierarchy elements with useful attributes
+                if self._has_useful_attributes(attrib):
+                    if elem is None:
+                        elem = XmlElementSnapshot(tag, dict(attrib))
+                    xml_elements.append(('xml', elem, '/'.join(path)))
                 
-        return elements
+                # Method 3: common banking patterns
+                for bucket, (attr, pattern, xpath) in zip(pattern_buckets, BANKING_PATTERNS):
+                    value = attrib.get(attr)
+                    if value and pattern in value:
+                        if elem is None:
+                            elem = XmlElementSnapshot(tag, dict(attrib))
+                        bucket.append(('pattern', elem, xpath))
+                
+        except Exception as e:
+            self.logger.warning(f"Failed to scan page source: {e}")
+        
+        return (
+            clickable_elements + input_elements + button_elements,
+            xml_elements,
+            [entry for bucket in pattern_buckets for entry in bucket]
+        )
     
     def _has_useful_attributes(self, attrib):
         """Check if XML element has useful attributes for automation"""
-        useful_attrs = ['resource-id', 'text', 'content-desc', 'clickable', 'class']
-        
         # Has resource-id
         if attrib.get('resource-id'):
             return True
             
-        # Has text content
-        if attrib.get('text') and len(attrib.get('text').strip()) > 0:
+        # Has text content (isspace avoids building a stripped copy)
+        text = attrib.get('text')
+        if text and not text.isspace():
             return True
             
         # Has content description
-        if attrib.get('content-desc') and len(attrib.get('content-desc').strip()) > 0:
+        content_desc = attrib.get('content-desc')
+        if content_desc and not content_desc.isspace():
             return True
             
         # Is clickable
-        if attrib.get('clickable') == 'true':
-            return True
-            
-        return False
+        return attrib.get('clickable') == 'true'
     
     def _merge_and_deduplicate(self, *element_lists):
         """Merge element lists and remove duplicates"""
@@ -296,11 +378,8 @@ class BankingElementScanner:
             for source, element, extra_info in element_list:
                 try:
                     # Create unique identifier for element
-                    bounds = element.get_attribute('bounds') if hasattr(element, 'get_attribute') else element.attrib.get('bounds', '')
-                    resource_id = element.get_attribute('resource-id') if hasattr(element, 'get_attribute') else element.attrib.get('resource-id', '')
-                    text = element.get_attribute('text') if hasattr(element, 'get_attribute') else element.attrib.get('text', '')
-                    
-                    element_id = f"{bounds}_{resource_id}_{text}"
+                    attrib = element.attrib
+                    element_id = (attrib.get('bounds', ''), attrib.get('resource-id', ''), attrib.get('text', ''))
                     
                     if element_id not in seen_elements:
                         seen_elements.add(element_id)
@@ -317,50 +396,27 @@ class BankingElementScanner:
         source, element, extra_info = element_data
         
         try:
-            # Handle different element types (WebDriver element vs XML element)
-            if hasattr(element, 'get_attribute'):
-                # WebDriver element
-                element_info = {
-                    'detection_source': source,
-                    'detection_info': extra_info,
-                    'class_name': element.tag_name,
-                    'resource_id': element.get_attribute('resource-id') or '',
-                    'text': element.get_attribute('text') or '',
-                    'content_desc': element.get_attribute('content-desc') or '',
-                    'bounds': element.get_attribute('bounds') or '',
-                    'clickable': element.get_attribute('clickable') == 'true',
-                    'enabled': element.get_attribute('enabled') == 'true',
-                    'displayed': element.is_displayed() if hasattr(element, 'is_displayed') else True,
-                    'checkable': element.get_attribute('checkable') == 'true',
-                    'checked': element.get_attribute('checked') == 'true',
-                    'focusable': element.get_attribute('focusable') == 'true',
-                    'focused': element.get_attribute('focused') == 'true',
-                    'password': element.get_attribute('password') == 'true',
-                    'scrollable': element.get_attribute('scrollable') == 'true',
-                    'long_clickable': element.get_attribute('long-clickable') == 'true',
-                }
-            else:
-                # XML element
-                attrib = element.attrib
-                element_info = {
-                    'detection_source': source,
-                    'detection_info': extra_info,
-                    'class_name': element.tag,
-                    'resource_id': attrib.get('resource-id', ''),
-                    'text': attrib.get('text', ''),
-                    'content_desc': attrib.get('content-desc', ''),
-                    'bounds': attrib.get('bounds', ''),
-                    'clickable': attrib.get('clickable') == 'true',
-                    'enabled': attrib.get('enabled') == 'true',
-                    'displayed': attrib.get('displayed') != 'false',
-                    'checkable': attrib.get('checkable') == 'true',
-                    'checked': attrib.get('checked') == 'true',
-                    'focusable': attrib.get('focusable') == 'true',
-                    'focused': attrib.get('focused') == 'true',
-                    'password': attrib.get('password') == 'true',
-                    'scrollable': attrib.get('scrollable') == 'true',
-                    'long_clickable': attrib.get('long-clickable') == 'true',
-                }
+            # Page-source snapshot element
+            attrib = element.attrib
+            element_info = {
+                'detection_source': source,
+                'detection_info': extra_info,
+                'class_name': element.tag,
+                'resource_id': attrib.get('resource-id', ''),
+                'text': attrib.get('text', ''),
+                'content_desc': attrib.get('content-desc', ''),
+                'bounds': attrib.get('bounds', ''),
+                'clickable': attrib.get('clickable') == 'true',
+                'enabled': attrib.get('enabled') == 'true',
+                'displayed': attrib.get('displayed') != 'false',
+                'checkable': attrib.get('checkable') == 'true',
+                'checked': attrib.get('checked') == 'true',
+                'focusable': attrib.get('focusable') == 'true',
+                'focused': attrib.get('focused') == 'true',
+                'password': attrib.get('password') == 'true',
+                'scrollable': attrib.get('scrollable') == 'true',
+                'long_clickable': attrib.get('long-clickable') == 'true',
+            }
             
             # Generate locators
             element_info['locators'] = self._generate_locators(element_info)
@@ -431,6 +487,30 @@ class BankingElementScanner:
     
     def _classify_element_safety(self, element_info):
         """Classify element safety for banking automation"""
+        # Everything the classification reads, so repeated elements (list rows,
+        # toolbar icons) share one result
+        cache_key = (
+            element_info.get('resource_id', ''),
+            element_info.get('text', ''),
+            element_info.get('content_desc', ''),
+            element_info.get('class_name', ''),
+            bool(element_info.get('password')),
+            bool(element_info.get('clickable'))
+        )
+        
+        cached = self._classification_cache.get(cache_key)
+        if cached is None:
+            cached = self._classify_element_safety_uncached(element_info)
+            if len(self._classification_cache) >= CLASSIFICATION_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._classification_cache[next(iter(self._classification_cache))]
+            self._classification_cache[cache_key] = cached
+        
+        # Hand out copies so callers mutating a result can't poison the cache
+        return dict(cached)
+    
+    def _classify_element_safety_uncached(self, element_info):
+        """Classify an element from its text, password and clickable flags (no caching)"""
         
         # Combine all text for analysis
         all_text = ' '.join([
@@ -440,19 +520,18 @@ class BankingElementScanner:
             element_info.get('class_name', '')
         ]).lower()
         
-        # Check for high-risk patterns
-        for pattern in self.banking_patterns['HIGH_RISK']:
-            if pattern in all_text:
+        # Check for high-, medium- and low-risk patterns
+        match = self._find_risk_pattern(all_text)
+        if match:
+            level, pattern = match
+            if level == 'HIGH_RISK':
                 return {
                     'level': 'HIGH_RISK',
                     'reason': f'Contains high-risk pattern: {pattern}',
                     'color': 'red',
                     'automation_allowed': False
                 }
-        
-        # Check for medium-risk patterns
-        for pattern in self.banking_patterns['MEDIUM_RISK']:
-            if pattern in all_text:
+            elif level == 'MEDIUM_RISK':
                 return {
                     'level': 'MEDIUM_RISK',
                     'reason': f'Contains medium-risk pattern: {pattern}',
@@ -460,10 +539,7 @@ class BankingElementScanner:
                     'automation_allowed': True,
                     'requires_caution': True
                 }
-        
-        # Check for low-risk patterns
-        for pattern in self.banking_patterns['LOW_RISK']:
-            if pattern in all_text:
+            else:
                 return {
                     'level': 'LOW_RISK',
                     'reason': f'Contains low-risk pattern: {pattern}',
@@ -497,6 +573,19 @@ class BankingElementScanner:
                 'automation_allowed': True
             }
     
+    def _find_risk_pattern(self, all_text):
+        """Return (level, pattern) for the first banking pattern found, most severe level first"""
+        if self._pattern_automaton is not None:
+            # One pass over the text instead of a substring test per pattern
+            match = min((value for _, value in self._pattern_automaton.iter(all_text)), default=None)
+            return match[2:] if match else None
+        
+        for level in RISK_LEVELS:
+            for pattern in self.banking_patterns[level]:
+                if pattern in all_text:
+                    return level, pattern
+        return None
+    
     def _categorize_element(self, element_info):
         """Categorize element by function"""
         class_name = element_info.get('class_name', '').lower()
@@ -558,53 +647,28 @@ class BankingElementScanner:
     
     def _generate_statistics(self, elements):
         """Generate statistics about scanned elements"""
-        stats = {
+        safety = [element.get('safety_classification', {}) for element in elements]
+        
+        # Automation summary
+        automation = Counter(
+            'high_risk' if classification.get('level') == 'HIGH_RISK'
+            else 'requires_caution' if classification.get('requires_caution')
+            else 'safe_to_automate'
+            for classification in safety
+        )
+        
+        return {
             'total_elements': len(elements),
-            'by_safety_level': {},
-            'by_category': {},
-            'by_interaction_type': {},
+            'by_safety_level': dict(Counter(classification.get('level', 'UNKNOWN') for classification in safety)),
+            'by_category': dict(Counter(element.get('category', 'other') for element in elements)),
+            'by_interaction_type': dict(Counter(map(_interaction_type, elements))),
             'automation_summary': {
-                'safe_to_automate': 0,
-                'requires_caution': 0,
-                'high_risk': 0,
-                'no_stable_locator': 0
+                'safe_to_automate': automation['safe_to_automate'],
+                'requires_caution': automation['requires_caution'],
+                'high_risk': automation['high_risk'],
+                'no_stable_locator': sum(1 for element in elements if not _has_stable_locator(element))
             }
         }
-        
-        for element in elements:
-            # Safety level statistics
-            safety_level = element.get('safety_classification', {}).get('level', 'UNKNOWN')
-            stats['by_safety_level'][safety_level] = stats['by_safety_level'].get(safety_level, 0) + 1
-            
-            # Category statistics
-            category = element.get('category', 'other')
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Interaction type
-            if element.get('clickable'):
-                interaction_type = 'clickable'
-            elif 'EditText' in element.get('class_name', ''):
-                interaction_type = 'input'
-            else:
-                interaction_type = 'display'
-            
-            stats['by_interaction_type'][interaction_type] = stats['by_interaction_type'].get(interaction_type, 0) + 1
-            
-            # Automation summary
-            safety = element.get('safety_classification', {})
-            locators = element.get('locators', {})
-            
-            if safety.get('level') == 'HIGH_RISK':
-                stats['automation_summary']['high_risk'] += 1
-            elif safety.get('requires_caution'):
-                stats['automation_summary']['requires_caution'] += 1
-            else:
-                stats['automation_summary']['safe_to_automate'] += 1
-            
-            if not locators.get('resource_id') and not locators.get('accessibility_id'):
-                stats['automation_summary']['no_stable_locator'] += 1
-        
-        return stats
     
     def _generate_banking_warnings(self, elements):
         """Generate banking-specific warnings"""
@@ -620,23 +684,20 @@ class BankingElementScanner:
         if password_fields > 0:
             warnings.append(f"🔒 Found {password_fields} password field(s) - never automate these")
         
-        # Check for transaction-related elements
-        transaction_keywords = ['transfer', 'send', 'pay', 'amount', 'confirm']
-        transaction_elements = []
+        # Check for transaction-related elements (counted, not collected)
+        transaction_count = 0
         for element in elements:
-            element_text = ' '.join([
-                element.get('resource_id', ''),
-                element.get('text', ''),
-                element.get('content_desc', '')
-            ]).lower()
+            element_text = (
+                f"{element.get('resource_id', '')} {element.get('text', '')} {element.get('content_desc', '')}"
+            ).lower()
             
-            for keyword in transaction_keywords:
+            for keyword in TRANSACTION_KEYWORDS:
                 if keyword in element_text:
-                    transaction_elements.append(element)
+                    transaction_count += 1
                     break
         
-        if transaction_elements:
-            warnings.append(f"💰 Found {len(transaction_elements)} transaction-related elements - high compliance risk")
+        if transaction_count:
+            warnings.append(f"💰 Found {transaction_count} transaction-related elements - high compliance risk")
         
         # Check for elements without stable locators
         unstable_locators = sum(1 for e in elements if not e.get('locators', {}).get('resource_id') and not e.get('locators', {}).get('accessibility_id'))